@@ -1,15 +1,25 @@
-from python_module3_marker import solveGame
+from python_module3_marker import solveGame, all_words, newTimeouts, skippedResult, repeatedError
+from hangman_policy import getPolicy, setPolicy
+from hangman_simulator import expectedOutcomes, matchTrajectory
+from hangman_sprt import sprtTest, default_sprt
+from hangman_async import repeatSolverMany
+from hangman_results import ResultWriter, readResults
+from hangman_cache import GradingCache, isComplete, markCached, cachedGame
+from hangman_timings import newHistograms, addTimings, histogramRows, bucket_names
+from hangman_cluster import ClusterPool
 from scipy import special
-import pickle as pkl
 import math
 from tqdm import tqdm
 import os
 import glob
 import multiprocessing as mp
+import queue
 import random
 import csv
 from copy import deepcopy
 
+marker_files = ['analyse_multiple_files.py', 'python_module3_marker.py', 'hangman_async.py', 'hangman_benchmark.py', 'hangman_cache.py', 'hangman_cluster.py', 'hangman_direct.py', 'hangman_parser.py', 'hangman_policy.py', 'hangman_results.py', 'hangman_simulator.py', 'hangman_sprt.py', 'hangman_timings.py', 'hangman_zygote.py'] # the marker's own .py files, which are never graded (add any new module of the marker here)
+
 def getStatistics(no_trials):
     """
     This models the probability of success as a binomial distribution (for more information about how a binomial distribution is modelled see the calculateBinomialProbability function. It is well known that a binomial distribution has
@@ -25,14 +35,14 @@ def getStatistics(no_trials):
         no_trials (int): This is the number of times a student's script was tested.
 
     Returns:
-        A dictionary with the following keys. T_prob (float): is our estimate of the probability that our program correctly guesses a word when a word is randomly picked from our word list using a uniform distribution. no_trials (int): is the parameter passed to the function by the user. mu (float) is the mean acording to a binomial distrbution with probability of success as T_prob and the number of trials as no_trials. 3_sigma (float): is three standard deviations (i.e. ~99% confidence). u_bound (float): is the upper bound of the 99% confidence interval. l_bound (float): is the lower bound of the 99% confidence interval.
+        A dictionary with the following keys. T_prob (float): is the exact probability that our program correctly guesses a word when a word is randomly picked from our word list using a uniform distribution. no_trials (int): is the parameter passed to the function by the user. mu (float) is the mean acording to a binomial distrbution with probability of success as T_prob and the number of trials as no_trials. 3_sigma (float): is three standard deviations (i.e. ~99% confidence). u_bound (float): is the upper bound of the 99% confidence interval. l_bound (float): is the lower bound of the 99% confidence interval.
 
     Raises:
         None.
     """
 
-    T_prop = 0.764 # Our estimate of the probability that our program will win a game
-    mu = no_trials * T_prop # ~76.4 mean
+    T_prop = expectedOutcomes(all_words)['T_prob'] # the exact probability that our program will win a game (worked out by playing every word in hangman_simulator.py)
+    mu = no_trials * T_prop # mean
     sigma3 = 3 * math.sqrt(no_trials * T_prop * (1 - T_prop)) # three standard deviations
 
     u_bound = mu + sigma3 # upper bound 99% CI
@@ -61,39 +71,257 @@ def calculateBinomialProbability(no_successes, no_trials, prob_success):
     no_combs = special.comb(no_trials, no_successes, exact = True)
     return no_combs * (prob_success ** no_successes) * (1 - prob_success) ** (no_trials - no_successes)
 
-def listOfFilesToTest(list_of_python_files, no_repetitions, no_cores = None):
+def listOfFilesToTest(list_of_python_files, no_repetitions, no_cores = None, launcher = 'spawn', engine = 'pexpect', sprt = None, pool = None, max_repeated_errors = None, adaptive_timeouts = False, results_file = None, cache_dir = None, top_up = False, replay = None, timing_hook = None):
     """
-    This function plays multiple games of a list of Python hangman games in parallel and returns the results.
+    This function plays multiple games of a list of Python hangman games in parallel and returns the results. With the 'pexpect' engine every game is a separate task (see the streamResults function) so all the cores are kept busy however many files there are, and a progress bar shows how many games have been played.
 
     Args:
 	list_of_python_files (list (str)): A list of hangman games to play where each string is a path to the Python file.
 	no_repetitions (int): Number of times each hangman game is played.
 	no_cores (None or int): Each hangman game can be played in parallel. no_cores gives the number of processes that can be spawned at one time. The default of None means use all available cores or is an integer that specifies how many processes to spawn simultaneously.
+	launcher (str): How each game is started, either 'spawn' (default) or 'zygote' (see the spawnGame function in python_module3_marker.py). This is only used by the 'pexpect' engine.
+	engine (str): How the games are played. 'pexpect' (default) plays one game at a time in each process using the solveGame function. 'async' splits the files between the processes and each process plays many games at the same time on an asyncio event loop (see hangman_async.py), which is much faster as the games spend most of their time waiting for the student's script.
+	sprt (None or dict): The default of None plays every game no_repetitions times. Otherwise a file stops being played as soon as the sequential probability ratio test with these settings (see default_sprt and the sprtTest function in hangman_sprt.py) has decided if it passes or fails, so no_repetitions is only reached for borderline files.
+	pool (None, multiprocessing.Pool or ClusterPool): A pool to play the games in so that one pool can be used for a whole run. The pool must have been created with createPool, or be a ClusterPool (see hangman_cluster.py) to play the games on other computers with the 'pexpect' engine. The default of None creates a pool for this call and closes it afterwards.
+	max_repeated_errors (None or int): If not None a file stops being played once the same error code has been returned this many times, and the games that were not played are returned as skipped with that error code (see the repeatedError function in python_module3_marker.py).
+	adaptive_timeouts (bool): If True the time solveGame waits for each file to respond adapts to how quickly that file has responded so far (see the newTimeouts function in python_module3_marker.py). The default of False always waits one second.
+	results_file (None or str): If not None every game is written to this file (a new file is started) with a ResultWriter (see hangman_results.py) instead of being kept in memory, and None is returned. With the 'pexpect' engine each game is written as soon as it has been played, with the 'async' engine the games of a few files at a time are written as soon as those files have been played.
+	cache_dir (None or str): If not None the games of each file are saved in this directory by a GradingCache (see hangman_cache.py) and a file that has already been played with the same source, marker and settings isn't played again. Its saved games are returned (or written to results_file) with 'cached' in their hist. Files with exactly the same script are only played once and all of them are given its games.
+	top_up (bool): What to do with a cached file that needs more games than were saved (e.g. no_repetitions has gone up). If True only the missing games are played and added to the saved ones, the default of False plays the file again from scratch.
+	replay (None or list (str)): Files in list_of_python_files whose saved games are thrown away so that they are played again from scratch (e.g. to check that a 'fail' or an 'Expect error' wasn't just bad luck). The new games replace the saved ones.
+	timing_hook (None or callable): Called in the worker processes every time a phase of a game has been timed (see the solveGame function). It has to be picklable and is only used by the 'pexpect' engine. The timing breakdown of each game is in hist['timings'] whether or not this is used.
 
     Returns:
-	A list of objects returned by the repeatSolver function for each of the hangman games to test.
+	A list of objects returned by the repeatSolver function for each of the hangman games to test, or None if results_file is given.
 
     Raises:
 	None.
     """
 
     # how many CPU cores to use (default is all available cores anything else needs to be passed by the user)
-    if no_cores == None:
-        pool = mp.Pool() # use all available cores
+    no_processes = os.cpu_count() if no_cores == None else no_cores
+
+    cache = GradingCache(cache_dir, sprt, max_repeated_errors, adaptive_timeouts) if cache_dir != None else None
+    cached_records = [[] for _ in list_of_python_files] # the games of each file that were saved by an earlier run
+    if cache != None:
+        for file_name in [file_name for file_name in list_of_python_files if replay != None and file_name in replay]: # before anything is loaded as a copy of the same script under another name shares the saved games
+            cache.clear(file_name)
+        for file_idx, file_name in enumerate(list_of_python_files):
+            cached_records[file_idx] = cache.load(file_name)[:no_repetitions]
+            if not top_up and not isComplete([(record['result'],) for record in cached_records[file_idx]], no_repetitions, sprt, max_repeated_errors): # the file needs more games so it is played again from scratch
+                cache.clear(file_name)
+                cached_records[file_idx] = []
+    same_script = {} # the index of each file that is played: the indexes of the files that get its games, more than one if the same script was submitted under different names (as they share their saved games they are only played once)
+    first_idxs = {} # cache key: the index of the first file with that key
+    for file_idx, file_name in enumerate(list_of_python_files):
+        first_idx = first_idxs.setdefault(cache.key(file_name), file_idx) if cache != None else file_idx
+        same_script.setdefault(first_idx, []).append(file_idx)
+    previous_outcomes = [[(record['result'],) for record in records] for records in cached_records]
+    files_to_play = [file_idx for file_idx in same_script if not isComplete(previous_outcomes[file_idx], no_repetitions, sprt, max_repeated_errors)]
+
+    own_pool = pool == None
+    if own_pool:
+        pool = createPool(no_cores)
+    writer = ResultWriter(results_file) if results_file != None else None
+    if writer != None:
+        for records in cached_records:
+            for record in records:
+                writer.writeRecord(markCached(record))
+        results = None
     else:
-        pool = mp.Pool(processes = no_cores) # use no_cores number of cores
+        results = [[cachedGame(record) for record in records] for records in cached_records]
 
-    results = pool.starmap(repeatSolver, zip(list_of_python_files, [no_repetitions] * len(list_of_python_files))) # play the game no_repetitions number of times for each of the python files (each file is tested in parallel
+    def saveGame(file_idx, result):
+        if cache != None:
+            cache.append(list_of_python_files[file_idx], *result)
+        for same_idx in same_script[file_idx]:
+            if writer != None:
+                writer.write(list_of_python_files[same_idx], *result)
+            else:
+                results[same_idx].append(result)
+
+    try:
+        if engine == 'async':
+            max_concurrent_games = 64
+            games_in_flight = 4 if sprt != None or max_repeated_errors != None else no_repetitions # the most games of one file that are played at the same time (see the batch_size of the repeatSolverAsync function)
+            files_per_task = max(1, min(max_concurrent_games // games_in_flight, -(-len(files_to_play) // no_processes))) # enough files to keep an event loop busy, but few enough that the games are saved soon after they have been played and that every process gets some files
+            file_chunks = [files_to_play[idx:idx + files_per_task] for idx in range(0, len(files_to_play), files_per_task)]
+            tasks = [(chunk, [list_of_python_files[file_idx] for file_idx in chunk], no_repetitions, max_concurrent_games, sprt, max_repeated_errors, adaptive_timeouts, [previous_outcomes[file_idx] for file_idx in chunk]) for chunk in file_chunks]
+            for chunk, chunk_result in pool.imap_unordered(playFilesAsync, tasks): # each process plays all the games of a few files at the same time and the games are saved as soon as those files have been played
+                for file_idx, file_results in zip(chunk, chunk_result):
+                    for result in file_results:
+                        saveGame(file_idx, result)
+        else:
+            no_played = [len(previous) for previous in previous_outcomes] # the number of games played of each file
+            with tqdm(total = sum([no_repetitions - no_played[file_idx] for file_idx in files_to_play]), unit = 'game') as progress_bar: # show how many games have been played
+                for idx, result, file_finished in streamResults([list_of_python_files[file_idx] for file_idx in files_to_play], no_repetitions, pool, no_processes, launcher, sprt, max_repeated_errors, adaptive_timeouts, [previous_outcomes[file_idx] for file_idx in files_to_play], timing_hook):
+                    file_idx = files_to_play[idx]
+                    no_played[file_idx] += 1
+                    saveGame(file_idx, result)
+                    progress_bar.update(1)
+                    if file_finished:
+                        progress_bar.total -= no_repetitions - no_played[file_idx] # the games that were not needed because the sequential probability ratio test decided early (skipped games are returned so they are counted)
+                        progress_bar.refresh()
+                        tqdm.write('File ' + list_of_python_files[file_idx] + ' tested.')
+    finally:
+        if own_pool:
+            pool.close()
+            pool.join()
+        if writer != None:
+            writer.close()
 
     return results
 
-def repeatSolver(file_name, no_repetitions):
+def createPool(no_cores = None):
+    """
+    Creates a multiprocessing pool to play games in. Our strategy is compiled once here and handed to every worker instead of each worker compiling its own.
+
+    Args:
+	no_cores (None or int): The number of processes in the pool. The default of None means use all available cores.
+
+    Returns (multiprocessing.Pool):
+	The pool.
+
+    Raises:
+	None.
+    """
+
+    policy = getPolicy(all_words)
+    if no_cores == None:
+        return mp.Pool(initializer = setPolicy, initargs = (policy,)) # use all available cores
+    return mp.Pool(processes = no_cores, initializer = setPolicy, initargs = (policy,)) # use no_cores number of cores
+
+def playFilesAsync(task):
+    """
+    This plays every game of a few files with the repeatSolverMany function in hangman_async.py. This is one task of the 'async' engine of the listOfFilesToTest function.
+
+    Args:
+	task (tup): (chunk, *args) where chunk is anything that identifies the files (it is returned as it is) and args are the arguments of repeatSolverMany.
+
+    Returns (tup):
+	(chunk, the list returned by repeatSolverMany).
+
+    Raises:
+	None.
+    """
+
+    return task[0], repeatSolverMany(*task[1:])
+
+_file_timeouts = {} # the adaptive timeouts of each file played by this process
+
+def playGames(file_name, no_games, launcher = 'spawn', adaptive_timeouts = False, timing_hook = None):
+    """
+    This plays a student's hangman game no_games times using the solveGame function. This is one task of the streamResults function.
+
+    Args:
+	file_name (str): The path to the student's hangman script that needs to be solved.
+	no_games (int): The number of times that we should play the game.
+	launcher (str): How each game is started (see the solveGame function).
+	adaptive_timeouts (bool): If True the timeouts adapt to how quickly the file has responded to this process so far (see the newTimeouts function in python_module3_marker.py).
+	timing_hook (None or callable): Called every time a phase of a game has been timed (see the solveGame function).
+
+    Returns (list):
+	A list of objects returned by the solveGame function.
+
+    Raises:
+	None.
+    """
+
+    timeouts = _file_timeouts.setdefault(file_name, newTimeouts()) if adaptive_timeouts else None
+    return [solveGame(file_name, launcher, timeouts, timing_hook) for _ in range(no_games)]
+
+def streamResults(list_of_python_files, no_repetitions, pool, no_processes, launcher = 'spawn', sprt = None, max_repeated_errors = None, adaptive_timeouts = False, previous_outcomes = None, timing_hook = None):
+    """
+    This plays the games of all of the files in pool and yields each result as soon as it has been played. Instead of one task per file (which leaves cores idle when there are fewer files than cores and waits for the slowest file) each task is a small chunk of games of one file, and the files take turns so every file makes progress. Only a couple of tasks per process are queued at a time, so a file that has been decided by the sequential probability ratio test stops getting new tasks straight away.
+
+    Args:
+	list_of_python_files (list (str)): A list of hangman games to play where each string is a path to the Python file.
+	no_repetitions (int): Number of times each hangman game is played.
+	pool (multiprocessing.Pool): The pool to play the games in.
+	no_processes (int): The number of processes in pool.
+	launcher (str): How each game is started (see the solveGame function).
+	sprt (None or dict): The settings of the sequential probability ratio test used to stop a file early (see the repeatSolver function), or None to play every game. The games of each file are given to the test in the order they were started (a game that finishes early waits for the games that were started before it), and games that come after the file has been decided are thrown away, so the results are the same as playing the games one after another. Otherwise wins, which take fewer turns than losses, would be counted first and the losses still being played when the file is decided would be thrown away, which biases the test towards 'pass'.
+	max_repeated_errors (None or int): The circuit breaker of each file (see the repeatedError function in python_module3_marker.py). Once it trips the file gets no more tasks and the rest of its games are yielded as skipped.
+	adaptive_timeouts (bool): If True the timeouts adapt to how quickly each file has responded (see the playGames function).
+	previous_outcomes (None or list): The results of games of each file that have already been played (e.g. cached by a GradingCache, see hangman_cache.py). These count towards no_repetitions, the sequential probability ratio test and the circuit breaker but are not yielded again. Only the result of each game is needed. The default of None starts every file from scratch.
+	timing_hook (None or callable): Called in the worker processes every time a phase of a game has been timed (see the solveGame function). It has to be picklable (e.g. a function defined at the top level of a module).
+
+    Returns (generator):
+	Yields (file_idx (int), result (tup), file_finished (bool)) where file_idx is the index of the file in list_of_python_files, result is the object returned by the solveGame function and file_finished is True if this is the last result of that file.
+
+    Raises:
+	Any error raised by a task.
+    """
+
+    if sprt == None and max_repeated_errors == None: # a few games per task saves on overheads when there are lots of games, but at most 4 so that a slow file is still spread between the processes
+        chunk_size = max(1, min(4, len(list_of_python_files) * no_repetitions // (no_processes * 4)))
+    else: # one game per task so that no games are wasted once a file has been decided or its circuit breaker has tripped
+        chunk_size = 1
+    T_prob = expectedOutcomes(all_words)['T_prob']
+    finished_tasks = queue.Queue() # the pool's result thread puts finished tasks here
+    if previous_outcomes == None:
+        previous_outcomes = [[] for _ in list_of_python_files]
+    outcomes = [[(result[0],) for result in previous] for previous in previous_outcomes] # the results of each file so far (only the result, not the hist, is needed for the sequential probability ratio test)
+    no_unscheduled = [no_repetitions - len(file_outcomes) for file_outcomes in outcomes] # the number of games of each file that haven't been given to the pool yet
+    finished = [no_games <= 0 for no_games in no_unscheduled]
+    no_started = [0 for _ in list_of_python_files] # the number of tasks of each file given to the pool, which numbers them in the order they were started
+    no_released = [0 for _ in list_of_python_files] # the number of tasks of each file whose games have been given to the test
+    waiting = [{} for _ in list_of_python_files] # task number: games of the tasks that finished before a task that was started earlier
+    no_in_flight = 0
+    next_file = 0
+    while True:
+        # keep two tasks per process queued, taking turns between the files that still need games
+        while no_in_flight < no_processes * 2:
+            for offset in range(len(list_of_python_files)):
+                file_idx = (next_file + offset) % len(list_of_python_files)
+                if no_unscheduled[file_idx] > 0 and not finished[file_idx]:
+                    break
+            else: # every game has been given to the pool
+                break
+            next_file = file_idx + 1
+            no_games = min(chunk_size, no_unscheduled[file_idx])
+            no_unscheduled[file_idx] -= no_games
+            pool.apply_async(playGames, (list_of_python_files[file_idx], no_games, launcher, adaptive_timeouts, timing_hook), callback = lambda chunk, file_idx = file_idx, task_no = no_started[file_idx]: finished_tasks.put((file_idx, task_no, chunk)), error_callback = lambda error, file_idx = file_idx, task_no = no_started[file_idx]: finished_tasks.put((file_idx, task_no, error)))
+            no_started[file_idx] += 1
+            no_in_flight += 1
+        if no_in_flight == 0:
+            return
+        file_idx, task_no, chunk = finished_tasks.get()
+        no_in_flight -= 1
+        if isinstance(chunk, BaseException):
+            raise chunk
+        waiting[file_idx][task_no] = chunk
+        games = []
+        while no_released[file_idx] in waiting[file_idx]: # release the tasks that have finished in the order they were started
+            games += waiting[file_idx].pop(no_released[file_idx])
+            no_released[file_idx] += 1
+        for result in games:
+            if finished[file_idx]: # the file was decided by an earlier game while this task was being played
+                break
+            outcomes[file_idx].append((result[0],))
+            if len(outcomes[file_idx]) == no_repetitions or (sprt != None and sprtTest(outcomes[file_idx], T_prob, sprt)[0] != None):
+                finished[file_idx] = True
+            error = repeatedError(outcomes[file_idx], max_repeated_errors)
+            if error != None and not finished[file_idx]: # the circuit breaker has tripped so the rest of the games are skipped
+                finished[file_idx] = True
+                yield file_idx, result, False
+                for idx in range(no_repetitions - len(outcomes[file_idx])):
+                    yield file_idx, skippedResult(error), idx == no_repetitions - len(outcomes[file_idx]) - 1
+                break
+            yield file_idx, result, finished[file_idx]
+
+def repeatSolver(file_name, no_repetitions, launcher = 'spawn', sprt = None, max_repeated_errors = None, adaptive_timeouts = False, timing_hook = None):
     """
     This this plays a student's hangman game multiple times using the solveGame function.
 
     Args:
 	file_name (str): The path to the student's hangman script that needs to be solved.
 	no_repetitions (int): The number of times that we should play the game.
+	launcher (str): How each game is started, either 'spawn' (default) or 'zygote' (see the spawnGame function in python_module3_marker.py).
+	sprt (None or dict): The default of None plays the game no_repetitions times. Otherwise the games stop as soon as the sequential probability ratio test with these settings (see the sprtTest function in hangman_sprt.py) has decided if the script passes or fails, so no_repetitions is the most games that are played.
+	max_repeated_errors (None or int): If not None the games stop once the same error code has been returned this many times and the rest of the games are returned as skipped with that error code (see the repeatedError function in python_module3_marker.py).
+	adaptive_timeouts (bool): If True the time solveGame waits for the script to respond adapts to how quickly it has responded so far (see the newTimeouts function in python_module3_marker.py).
+	timing_hook (None or callable): Called every time a phase of a game has been timed (see the solveGame function). The timing breakdown of each game is in hist['timings'] whether or not this is used.
 
     Returns (list):
 	A list of objects returned by the solveGame function.
@@ -102,50 +330,108 @@ def repeatSolver(file_name, no_repetitions):
 	None.
     """
 
-    all_words = ['rarely', 'universe', 'notice', 'sugar', 'interference', 'constitution', 'we', 'minus', 'breath', 'clarify', 'take', 'recording', 'amendment', 'hut', 'tip', 'logical', 'cast', 'title', 'brief', 'none', 'relative', 'recently', 'detail', 'port', 'such', 'complex', 'bath', 'soul', 'holder', 'pleasant', 'buy', 'federal', 'lay', 'currently', 'saint', 'for', 'simple', 'deliberately', 'means', 'peace', 'prove', 'sexual', 'chief', 'department', 'bear', 'injection', 'off', 'son', 'reflect', 'fast', 'ago', 'education', 'prison', 'birthday', 'variation', 'exactly', 'expect', 'engine', 'difficulty', 'apply', 'hero', 'contemporary', 'that', 'surprised', 'fear', 'convert', 'daily', 'yours', 'pace', 'shot', 'income', 'democracy', 'albeit', 'genuinely', 'commit', 'caution', 'try', 'membership', 'elderly', 'enjoy', 'pet', 'detective', 'powerful', 'argue', 'escape', 'timetable', 'proceeding', 'sector', 'cattle', 'dissolve', 'suddenly', 'teach', 'spring', 'negotiation', 'solid', 'seek', 'enough', 'surface', 'small', 'search'] # a list of all possible words from word_list.txt
     results = [] 
+    timeouts = newTimeouts() if adaptive_timeouts else None
     print('Testing file', file_name) # because this can take a long time these print outs let the user know how things are progressing
     for _ in range(no_repetitions):
-        results.append(solveGame(file_name)) # apply solveGame to file_name no_repetitions number of times
+        results.append(solveGame(file_name, launcher, timeouts, timing_hook)) # apply solveGame to file_name no_repetitions number of times
+        if sprt != None and sprtTest(results, expectedOutcomes(all_words)['T_prob'], sprt)[0] != None: # stop as soon as we know if the script passes or fails
+            break
+        error = repeatedError(results, max_repeated_errors)
+        if error != None: # the same error keeps happening so skip the rest of the games
+            results += [skippedResult(error) for _ in range(no_repetitions - len(results))]
+            break
     print('File', file_name, 'tested.') # because this can take a long time these print outs let the user know how things are progressing
     return results
 
 if __name__ == "__main__":
     # running this script will test all the python scripts in the current directory 100 times and make suggestions of if the student should pass or faiil
-    no_of_repetitions = 20
+    no_of_repetitions = 20 # the most games played for each file
+    sprt = default_sprt # stop playing a file as soon as we know if it passes or fails (set to None to always play no_of_repetitions games)
+    max_repeated_errors = 3 # stop playing a file once the same error has happened this many times (only matters if sprt is None as the sequential probability ratio test stops at the first error)
+    adaptive_timeouts = True # wait less for a file to respond once it has shown that it responds quickly
+    cache_dir = 'grading_cache' # save the games of each file so that running this again only plays files that are new or have changed (set to None to play every file every time)
+    top_up = True # if no_of_repetitions goes up then only play the extra games needed for files that have already been played (set to False to play them again from scratch)
+    replay_files = [] # files to play again from scratch even if they haven't changed, e.g. ['student1.py'] to check that a 'fail' or an error wasn't just bad luck (the saved games of these files are replaced)
+    cluster_address = None # set to e.g. ('192.168.0.10', 6000), with this computer's address on the network the workers are on, to hand the games to workers on other computers started with `python hangman_cluster.py 192.168.0.10 6000` instead of playing them on this computer. HANGMAN_CLUSTER_KEY must be set to the same secret everywhere (see hangman_cluster.py)
+    min_workers = 1 # the number of workers to wait for before playing any games (only used with cluster_address)
     file_list = []
     file_list = glob.glob('*.py') # get all .py files in the current directory
 
-    stats = getStatistics(no_of_repetitions) # get the upper and lower bound of the 99% confidence interval
-    file_list = list(set(file_list) - {'analyse_multiple_files.py', 'python_module3_marker.py'}) # these are .py files in the current directory that don't need to be tested
-    results = listOfFilesToTest(file_list, no_of_repetitions) # test all the .py files in the current directory
-    with open('results.pkl', 'wb') as f:
-        pkl.dump(results, f) # save all the results as a pickle file so that users can see what happened in more detail if strange behaviour occurs
+    skipped_files = sorted([file_name for file_name in file_list if file_name in marker_files])
+    if skipped_files:
+        print('Not testing the marker\'s own files:', ', '.join(skipped_files)) # so that a student's script with the same name as one of them is noticed
+    file_list = sorted([file_name for file_name in file_list if file_name not in marker_files]) # the marker's own .py files in the current directory don't need to be tested. They are sorted so that results.csv lists the files in the same order every run
+    pool, no_cores = None, None
+    if cluster_address != None:
+        pool = ClusterPool(cluster_address, min_workers)
+        no_cores = pool.wait_for_workers() # keep two games in flight for every process of the workers, as streamResults does on one computer
+        print('Playing the games on', min_workers, 'workers with', no_cores, 'processes.')
+    try:
+        listOfFilesToTest(file_list, no_of_repetitions, no_cores = no_cores, sprt = sprt, pool = pool, max_repeated_errors = max_repeated_errors, adaptive_timeouts = adaptive_timeouts, results_file = 'results.jsonl', cache_dir = cache_dir, top_up = top_up, replay = replay_files) # test all the .py files in the current directory and save every game in results.jsonl so that users can see what happened in more detail if strange behaviour occurs (see hangman_results.py)
+    finally:
+        if pool != None:
+            pool.close()
 
     ### PERFORM ANALYSIS
     summaries = [] # sumarise each 100 game test
-    result_counts = {'wins': 0, 'losses': 0, 'errors': []} # this will be used to count how many wins losses and errors occured for each file
-    # loop through all the results and count wins, losses, and errors for each file
-    for idx1 in range(len(results)): # each file
-        tmp_counts = deepcopy(result_counts)
-        for idx2 in range(len(results[idx1])): # each of the 100 games per file
-            if results[idx1][idx2][0] == True:
-                tmp_counts['wins'] += 1
-            elif results[idx1][idx2][0] == False:
-                tmp_counts['losses'] += 1
-            else: 
-                tmp_counts['errors'] += [results[idx1][idx2][0]]
+    result_counts = {'results': [], 'wins': 0, 'losses': 0, 'errors': [], 'unexpected': 0, 'cached': 0, 'timings': newHistograms()} # this will be used to count how many wins losses and errors occured for each file
+    file_counts = {file_name: deepcopy(result_counts) for file_name in file_list}
+    run_timings = newHistograms() # the timings of every game played in this run
+    # read the games back one at a time and count wins, losses, and errors for each file
+    for record in readResults('results.jsonl'):
+        tmp_counts = file_counts[record['file']]
+        tmp_counts['results'].append((record['result'],)) # only the result of each game is needed by the sequential probability ratio test
+        if record['result'] == True:
+            tmp_counts['wins'] += 1
+        elif record['result'] == False:
+            tmp_counts['losses'] += 1
+        else:
+            tmp_counts['errors'] += [record['result']]
+        if record.get('extra', {}).get('cached', False): # the game was saved by an earlier run
+            tmp_counts['cached'] += 1
+        elif 'timings' in record.get('extra', {}): # only the games played in this run are timed (skipped games have no timings)
+            addTimings(tmp_counts['timings'], record['extra']['timings'])
+            addTimings(run_timings, record['extra']['timings'])
+        if record['result'] in [True, False] and not matchTrajectory(record['result'], {'guess_hist': [chr(guess + ord('a')) for guess in record['guesses']], 'word_progress_hist': record['progress']}): # a correctly written script always plays exactly the same game as our simulation for one of the words
+            tmp_counts['unexpected'] += 1
+
+    for file_name in file_list: # each file
+        tmp_counts = file_counts[file_name]
+        no_games = len(tmp_counts['results']) # the number of games that were actually played
+        stats = getStatistics(no_games) # get the upper and lower bound of the 99% confidence interval
+        if sprt != None:
+            sprt_decision, sprt_statistic = sprtTest(tmp_counts['results'], stats['T_prob'], sprt)
+        else:
+            sprt_decision, sprt_statistic = None, 'NaN'
+        if tmp_counts['cached'] == 0:
+            from_cache = 'no'
+        elif tmp_counts['cached'] == no_games:
+            from_cache = 'yes'
+        else: # some of the games were saved by an earlier run and the rest were played to top it up
+            from_cache = 'topped up'
 
         if len(tmp_counts['errors']) > 0: #for each file see if there were any errors
-            summaries.append((file_list[idx1], tmp_counts['wins'], tmp_counts['losses'], tmp_counts['errors'], 'error', 'NaN')) # if there are errors then we can't fully test the hangman game so the last two columns are 'error' and 'NaN'.
+            summaries.append((file_name, tmp_counts['wins'], tmp_counts['losses'], tmp_counts['errors'], 'error', 'NaN', tmp_counts['unexpected'], no_games, sprt_statistic, from_cache)) # if there are errors then we can't fully test the hangman game so the last two columns are 'error' and 'NaN'.
+        elif sprt_decision in ['pass', 'fail']: # the sequential probability ratio test decided before no_of_repetitions games were played
+            summaries.append((file_name, tmp_counts['wins'], tmp_counts['losses'], tmp_counts['errors'], sprt_decision, calculateBinomialProbability(tmp_counts['wins'], no_games, stats['T_prob']), tmp_counts['unexpected'], no_games, sprt_statistic, from_cache))
         elif tmp_counts['wins'] > stats['l_bound'] and tmp_counts['wins'] < stats['u_bound']: # if the tests mean is within the 99% CI then it looks like the student's hangman works correctly so the last two columns are 'pass' and the probability that this result would occur according to the binomial distribution.
-            summaries.append((file_list[idx1], tmp_counts['wins'], tmp_counts['losses'], tmp_counts['errors'], 'pass', calculateBinomialProbability(tmp_counts['wins'], no_of_repetitions, stats['T_prob'])))
+            summaries.append((file_name, tmp_counts['wins'], tmp_counts['losses'], tmp_counts['errors'], 'pass', calculateBinomialProbability(tmp_counts['wins'], no_games, stats['T_prob']), tmp_counts['unexpected'], no_games, sprt_statistic, from_cache))
         else: # otherwise the program functioned correctly but did not statistically perform as expected (i.e. mean not within the 99% CI) so the last two columns are 'fail' and the probability that this result would occur according to the binomial distribution (i.e. probability that the game is correct but failed by chance). 
-            summaries.append((file_list[idx1], tmp_counts['wins'], tmp_counts['losses'], tmp_counts['errors'], 'fail', calculateBinomialProbability(tmp_counts['wins'], no_of_repetitions, stats['T_prob'])))
+            summaries.append((file_name, tmp_counts['wins'], tmp_counts['losses'], tmp_counts['errors'], 'fail', calculateBinomialProbability(tmp_counts['wins'], no_games, stats['T_prob']), tmp_counts['unexpected'], no_games, sprt_statistic, from_cache))
 
 
     with open('results.csv','w') as out: # save the results as a CSV file.
         csv_out=csv.writer(out, delimiter = ';')
-        csv_out.writerow(['file name', 'No. wins', 'No. losses', 'List of errors', 'Result', 'Probability that this result occurred by chance not error']) # column headers
+        csv_out.writerow(['file name', 'No. wins', 'No. losses', 'List of errors', 'Result', 'Probability that this result occurred by chance not error', 'No. unexpected games', 'No. games played', 'SPRT statistic', 'From cache']) # column headers
         for row in summaries:
             csv_out.writerow(row)
+
+    with open('timings.csv', 'w') as out: # save how long each phase of the games took for each file and for the whole run, so slow scripts and slow parts of the marker can be spotted
+        csv_out = csv.writer(out, delimiter = ';')
+        csv_out.writerow(['file name', 'Phase', 'No. timings', 'Total (s)', 'Mean (ms)', 'Max (ms)'] + bucket_names) # column headers
+        for file_name in file_list:
+            for row in histogramRows(file_name, file_counts[file_name]['timings']):
+                csv_out.writerow(row)
+        for row in histogramRows('all files', run_timings):
+            csv_out.writerow(row)
@@ -0,0 +1,226 @@
+import os
+import pty
+import shlex
+import time
+import asyncio
+import collections
+from python_module3_marker import all_words, newGameState, playTurn, newTimeouts, expectTimeout, recordLatency, skippedResult, repeatedError
+from hangman_simulator import expectedOutcomes
+from hangman_sprt import sprtTest
+from hangman_timings import newTimings, recordTiming
+from hangman_parser import OutputParser
+
+class AsyncPty():
+    """
+    This connects to a student's hangman script through a non-blocking pty that is watched by the asyncio event loop, so one event loop can play many games at once. It provides the small part of pexpect that solveGame uses (expect and sendline), and the output is read with the same OutputParser as solveGame (see hangman_parser.py) so parser.before() and parser.after() give the text the script stopped on.
+
+    Args:
+        master_fd (int): The master end of the pty that the student's script is running on.
+    """
+
+    def __init__(self, master_fd):
+        self.master_fd = master_fd
+        self.parser = OutputParser()
+        self.eof = False
+        self.data_ready = asyncio.Event()
+        os.set_blocking(master_fd, False)
+        asyncio.get_running_loop().add_reader(master_fd, self._read)
+
+    def _read(self):
+        try:
+            data = os.read(self.master_fd, 4096)
+        except BlockingIOError:
+            return
+        except OSError: # linux raises EIO once the script has ended and the pty has been closed
+            data = b''
+        if data:
+            self.parser.feed(data)
+        else:
+            self.eof = True
+            self.parser.end()
+            asyncio.get_running_loop().remove_reader(self.master_fd)
+        self.data_ready.set()
+
+    async def expect(self, timeout):
+        """
+        Waits for the script to ask for the next guess or to end in the same way as child.expect(['Please enter your next guess: ', pexpect.EOF]) in solveGame.
+
+        Args:
+            timeout (float): The number of seconds to wait before giving up.
+
+        Raises:
+            asyncio.TimeoutError if the script neither asks for a guess or ends within the timeout.
+        """
+
+        async def waitForStop():
+            while self.parser.stop == None:
+                self.data_ready.clear()
+                await self.data_ready.wait()
+
+        self.parser.nextTurn()
+        await asyncio.wait_for(waitForStop(), timeout)
+
+    def sendline(self, s):
+        os.write(self.master_fd, (s + os.linesep).encode())
+
+    def close(self):
+        if self.master_fd == -1:
+            return
+        if not self.eof:
+            asyncio.get_running_loop().remove_reader(self.master_fd)
+        os.close(self.master_fd)
+        self.master_fd = -1
+
+async def solveGameAsync(file_path, timeouts = None):
+    """
+    This plays a student's hangman game in the same way as the solveGame function in python_module3_marker.py except that it runs on the asyncio event loop, so many games can be played at once by one process instead of blocking a whole process on each game.
+
+    Args:
+        file_path (str): A string of a path to the student's hangman script.
+        timeouts (None or dict): The default of None waits one second for the script to ask for a guess or end. Otherwise the adaptive timeouts of this script (the same as in solveGame).
+
+    Returns:
+        (return result (bool or str), hist (dict)) (tup): the same as the solveGame function.
+
+    Raises:
+        All errors should be dealt with try and exception statements so that an error string is returned instead of a Python Error being raised.
+    """
+
+    hist = {'guess_hist': [], 'word_progress_hist': [], 'remaining_words_hist': [], 'letters_by_occurence_hist': [], 'timings': newTimings()}
+    timings = hist['timings']
+    game_state = newGameState(hist)
+    # run the student's script on a new pty in the same way as pexpect.spawn('python ' + file_path)
+    game_start = time.monotonic()
+    try:
+        master_fd, slave_fd = pty.openpty()
+    except:
+        return 'Spawn error', hist
+    try:
+        process = await asyncio.create_subprocess_exec(*shlex.split('python ' + file_path), stdin = slave_fd, stdout = slave_fd, stderr = slave_fd, start_new_session = True)
+    except:
+        os.close(master_fd)
+        return 'Spawn error', hist
+    finally:
+        os.close(slave_fd)
+    recordTiming(timings, 'spawn', game_start)
+    child = AsyncPty(master_fd)
+
+    try:
+        first_prompt = True
+        while True:
+            try:
+                sent_time = time.monotonic()
+                await child.expect(expectTimeout(timeouts, first_prompt))
+            except asyncio.CancelledError: # the game isn't needed any more (see repeatSolverAsync)
+                raise
+            except:
+                recordTiming(timings, 'expect', sent_time)
+                return 'Expect error', hist
+            latency = recordTiming(timings, 'expect', sent_time)
+            if not first_prompt:
+                recordLatency(timeouts, latency)
+            first_prompt = False
+
+            decode_start = time.monotonic()
+            try:
+                bfr_txt = child.parser.before()
+            except:
+                return 'bfr decode error', hist
+            afr_txt = child.parser.after()
+            recordTiming(timings, 'decode', decode_start)
+            guess_start = time.monotonic()
+            finished, value = playTurn(game_state, bfr_txt, afr_txt)
+            recordTiming(timings, 'guess', guess_start)
+            if finished:
+                return value, hist
+            send_start = time.monotonic()
+            child.sendline(value)
+            recordTiming(timings, 'send', send_start)
+    finally: # stop the script if it is still running and tidy up the pty
+        child.close()
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+        await process.wait()
+        recordTiming(timings, 'total', game_start)
+
+async def repeatSolverAsync(file_name, no_repetitions, semaphore, sprt = None, max_repeated_errors = None, adaptive_timeouts = False, batch_size = 4, previous_outcomes = None):
+    """
+    This is the asyncio version of the repeatSolver function in analyse_multiple_files.py. The games are played at the same time, limited by semaphore.
+
+    Args:
+        file_name (str): The path to the student's hangman script that needs to be solved.
+        no_repetitions (int): The number of times that we should play the game.
+        semaphore (asyncio.Semaphore): Limits how many games are played at the same time by the event loop.
+        sprt (None or dict): If not None the games stop as soon as the sequential probability ratio test with these settings (see hangman_sprt.py) has decided if the script passes or fails.
+        max_repeated_errors (None or int): If not None the games stop once the same error code has been returned this many times and the rest are returned as skipped (see the repeatedError function in python_module3_marker.py).
+        adaptive_timeouts (bool): If True the timeouts adapt to how quickly the script has responded so far (see the newTimeouts function in python_module3_marker.py).
+        batch_size (int): When sprt or max_repeated_errors is used at most this many games of the file are played at the same time. The games are checked in the order they were started, so they stop after exactly the same game as the repeatSolver function would, and the games that are still being played are cancelled.
+        previous_outcomes (None or list): The results of games that have already been played (see the streamResults function in analyse_multiple_files.py). They count towards no_repetitions, sprt and max_repeated_errors but are not returned.
+
+    Returns (list):
+        A list of objects returned by the solveGameAsync function.
+    """
+
+    timeouts = newTimeouts() if adaptive_timeouts else None
+
+    async def limitedGame():
+        async with semaphore:
+            return await solveGameAsync(file_name, timeouts)
+
+    print('Testing file', file_name)
+    results = [(result[0],) for result in previous_outcomes] if previous_outcomes != None else []
+    no_previous = len(results)
+    if sprt == None and max_repeated_errors == None:
+        results += await asyncio.gather(*[limitedGame() for _ in range(no_repetitions - no_previous)])
+    else:
+        games = collections.deque() # the games that are being played, in the order they were started
+        no_started = len(results)
+        try:
+            while len(results) < no_repetitions:
+                while len(games) < batch_size and no_started < no_repetitions:
+                    games.append(asyncio.ensure_future(limitedGame()))
+                    no_started += 1
+                results.append(await games.popleft()) # check each game as soon as it and every game started before it have finished
+                if sprt != None and sprtTest(results, expectedOutcomes(all_words)['T_prob'], sprt)[0] != None:
+                    break
+                error = repeatedError(results, max_repeated_errors)
+                if error != None:
+                    results += [skippedResult(error) for _ in range(no_repetitions - len(results))]
+                    break
+        finally: # the file has been decided so the games that are still being played aren't needed
+            for game in games:
+                game.cancel()
+            await asyncio.gather(*games, return_exceptions = True) # wait for them to stop their scripts
+    print('File', file_name, 'tested.')
+    return results[no_previous:]
+
+async def _repeatSolverManyAsync(list_of_python_files, no_repetitions, max_concurrent_games, sprt, max_repeated_errors, adaptive_timeouts, previous_outcomes):
+    semaphore = asyncio.Semaphore(max_concurrent_games)
+    if previous_outcomes == None:
+        previous_outcomes = [None] * len(list_of_python_files)
+    return await asyncio.gather(*[repeatSolverAsync(file_name, no_repetitions, semaphore, sprt, max_repeated_errors, adaptive_timeouts, previous_outcomes = previous) for file_name, previous in zip(list_of_python_files, previous_outcomes)])
+
+def repeatSolverMany(list_of_python_files, no_repetitions, max_concurrent_games = 64, sprt = None, max_repeated_errors = None, adaptive_timeouts = False, previous_outcomes = None):
+    """
+    This plays every game of every file in list_of_python_files on one asyncio event loop. listOfFilesToTest runs one of these per core.
+
+    Args:
+        list_of_python_files (list (str)): A list of paths to the hangman games to play.
+        no_repetitions (int): Number of times each hangman game is played.
+        max_concurrent_games (int): The maximum number of games that are played at the same time by the event loop.
+        sprt (None or dict): The settings of the sequential probability ratio test used to stop playing a file early (see the repeatSolverAsync function), or None to play every game.
+        max_repeated_errors (None or int): The circuit breaker of each file (see the repeatSolverAsync function).
+        adaptive_timeouts (bool): If True the timeouts adapt to how quickly each file has responded (see the repeatSolverAsync function).
+        previous_outcomes (None or list): The results of games of each file that have already been played (see the repeatSolverAsync function).
+
+    Returns (list):
+        A list of objects returned by the repeatSolverAsync function for each of the files, in the same order as list_of_python_files.
+
+    Raises:
+        None.
+    """
+
+    return asyncio.run(_repeatSolverManyAsync(list_of_python_files, no_repetitions, max_concurrent_games, sprt, max_repeated_errors, adaptive_timeouts, previous_outcomes))
@@ -0,0 +1,195 @@
+import os
+import sys
+import glob
+import json
+import math
+import time
+import random
+import shutil
+import tempfile
+import resource
+import multiprocessing as mp
+from python_module3_marker import solveGame, solveGameWord, all_words
+from hangman_zygote import measureColdStart
+
+reference_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reference_submissions') # the reference scripts that the marker is benchmarked against
+word_list_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'word_list.txt')
+
+def percentile(values, q):
+    """
+    Returns the q-th percentile (0 to 100) of values using the nearest rank, or NaN if there are no values.
+    """
+
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+def summariseGames(results, seconds):
+    """
+    Works out the throughput and latencies of a set of games.
+
+    Args:
+        results (list): The (return result, hist) tuples returned by the solver for each game.
+        seconds (float): How long it took to play all of the games.
+
+    Returns (dict):
+        no_games (int), seconds (float), games_per_sec (float), turn_latency_p50 and turn_latency_p99 (float): the percentiles of the time the scripts took to respond to each guess, first_prompt_p50 (float): the median time to the first prompt of each game (which includes starting the script), spawn_latency_p50 (float): the median time the zygote took to fork each game (NaN if the zygote wasn't used), outcomes (dict): how many times each result was returned.
+    """
+
+    turn_latencies = []
+    first_prompts = []
+    spawn_latencies = []
+    outcomes = {}
+    for result, hist in results:
+        latencies = hist.get('timings', {}).get('expect', [])
+        first_prompts += latencies[:1]
+        turn_latencies += latencies[1:]
+        if 'spawn_latency' in hist:
+            spawn_latencies.append(hist['spawn_latency'])
+        outcomes[str(result)] = outcomes.get(str(result), 0) + 1
+    return {'no_games': len(results), 'seconds': seconds, 'games_per_sec': len(results) / seconds if seconds > 0 else float('nan'), 'turn_latency_p50': percentile(turn_latencies, 50), 'turn_latency_p99': percentile(turn_latencies, 99), 'first_prompt_p50': percentile(first_prompts, 50), 'spawn_latency_p50': percentile(spawn_latencies, 50), 'outcomes': outcomes}
+
+def benchmarkSolveGame(file_name, no_games, launcher = 'spawn'):
+    # plays file_name no_games times one after another with the solveGame function
+    start = time.monotonic()
+    results = [solveGame(file_name, launcher) for _ in range(no_games)]
+    return summariseGames(results, time.monotonic() - start)
+
+def benchmarkSolveGameWord(file_name, no_games):
+    # plays file_name no_games times one after another with the solveGameWord function, using the same random words every run
+    words = random.Random(0).choices(all_words, k = no_games)
+    start = time.monotonic()
+    results = [solveGameWord(file_name, word) for word in words]
+    return summariseGames(results, time.monotonic() - start)
+
+def benchmarkListOfFiles(file_names, no_repetitions, no_cores, launcher = 'spawn'):
+    # plays every file no_repetitions times with the listOfFilesToTest function (without stopping any file early)
+    from analyse_multiple_files import listOfFilesToTest
+    start = time.monotonic()
+    results = listOfFilesToTest(file_names, no_repetitions, no_cores = no_cores, launcher = launcher)
+    return summariseGames([result for file_results in results for result in file_results], time.monotonic() - start)
+
+def _runCase(work_dir, function, args, connection):
+    # runs one benchmark in its own process so that its peak memory isn't mixed up with the other benchmarks
+    os.chdir(work_dir)
+    sys.stdout = sys.stderr = open(os.devnull, 'w') # the progress bars and print outs would get in the way of the report
+    summary = function(*args)
+    summary['peak_memory_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 # ru_maxrss is in kilobytes on Linux
+    summary['peak_child_memory_mb'] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024 # the largest of the student's scripts and pool workers
+    connection.send(summary)
+    connection.close()
+
+def runCase(work_dir, function, *args):
+    """
+    Runs one of the benchmark functions in a new process (so that its peak memory can be measured on its own) with work_dir as the current directory.
+
+    Returns (dict):
+        The summary returned by the summariseGames function with peak_memory_mb and peak_child_memory_mb added.
+    """
+
+    context = mp.get_context('spawn') # a fresh interpreter so nothing is inherited from the other benchmarks
+    parent_connection, child_connection = context.Pipe(duplex = False)
+    process = context.Process(target = _runCase, args = (work_dir, function, args, child_connection))
+    process.start()
+    child_connection.close()
+    summary = parent_connection.recv()
+    process.join()
+    return summary
+
+def runBenchmarks(no_games = 5, no_repetitions = 10, core_counts = None, launchers = ['spawn', 'zygote']):
+    """
+    Benchmarks the marker against the reference scripts in reference_submissions. Each script is played no_games times with solveGame (with each launcher) and solveGameWord, and all of the scripts are played no_repetitions times together with listOfFilesToTest at each core count.
+
+    Args:
+        no_games (int): The number of games of each script played with solveGame and solveGameWord.
+        no_repetitions (int): The number of games of each script played with listOfFilesToTest.
+        core_counts (None or list(int)): The core counts to run listOfFilesToTest with. The default of None uses 1, 2, 4, ... up to the number of cores of this computer.
+        launchers (list(str)): The launchers to benchmark solveGame and listOfFilesToTest with (see the spawnGame function in python_module3_marker.py).
+
+    Returns (dict):
+        python_cold_start (float): how long it takes to start and stop an empty Python interpreter (what each game spends on spawning with the 'spawn' launcher), cpu_count (int), and cases (dict): the summary of each benchmark (see the runCase function) keyed by a name such as 'solveGame[spawn] correct.py' or 'listOfFilesToTest[spawn] 4 cores'.
+
+    Raises:
+        None.
+    """
+
+    if core_counts == None:
+        core_counts = [2 ** power for power in range(int(math.log2(os.cpu_count())) + 1)]
+        if core_counts[-1] != os.cpu_count():
+            core_counts.append(os.cpu_count())
+    work_dir = tempfile.mkdtemp() # the scripts are played in a directory of their own with a copy of word_list.txt, as they expect
+    try:
+        shutil.copy(word_list_path, work_dir)
+        file_names = []
+        for path in sorted(glob.glob(os.path.join(reference_dir, '*.py'))):
+            shutil.copy(path, work_dir)
+            file_names.append(os.path.basename(path))
+        benchmarks = {'python_cold_start': measureColdStart(), 'cpu_count': os.cpu_count(), 'cases': {}}
+        for file_name in file_names:
+            for launcher in launchers:
+                benchmarks['cases']['solveGame[' + launcher + '] ' + file_name] = runCase(work_dir, benchmarkSolveGame, file_name, no_games, launcher)
+            if file_name != 'hangs.py': # solveGameWord waits pexpect's default of 30 seconds for each stop so a script that hangs would take far too long
+                benchmarks['cases']['solveGameWord ' + file_name] = runCase(work_dir, benchmarkSolveGameWord, file_name, no_games)
+        for launcher in launchers:
+            for no_cores in core_counts:
+                benchmarks['cases']['listOfFilesToTest[' + launcher + '] ' + str(no_cores) + ' cores'] = runCase(work_dir, benchmarkListOfFiles, file_names, no_repetitions, no_cores, launcher)
+    finally:
+        shutil.rmtree(work_dir)
+    return benchmarks
+
+def compareBaseline(benchmarks, baseline, tolerance = 0.25):
+    """
+    Compares the benchmarks with a baseline saved by an earlier run to find regressions in the marker.
+
+    Args:
+        benchmarks (dict): The benchmarks returned by the runBenchmarks function.
+        baseline (dict): The benchmarks of an earlier run (e.g. loaded from benchmark_baseline.json).
+        tolerance (float): How much worse (as a fraction) a measurement has to be before it counts as a regression, as timings vary from run to run.
+
+    Returns (list(str)):
+        A description of each regression. This is empty if there are none.
+
+    Raises:
+        None.
+    """
+
+    regressions = []
+    for name, case in benchmarks['cases'].items():
+        if name not in baseline['cases']:
+            continue
+        old_case = baseline['cases'][name]
+        deterministic = name.startswith('solveGameWord') or not {'True', 'False'} & set(old_case['outcomes']) # the scripts pick a random word so only the games with fixed words or that always end in an error have the same outcomes every run
+        if deterministic and case['outcomes'] != old_case['outcomes']:
+            regressions.append(name + ': outcomes changed from ' + str(old_case['outcomes']) + ' to ' + str(case['outcomes']))
+        if case['games_per_sec'] < old_case['games_per_sec'] * (1 - tolerance):
+            regressions.append(name + ': games/sec dropped from %.2f to %.2f' % (old_case['games_per_sec'], case['games_per_sec']))
+        for key in ['turn_latency_p50', 'turn_latency_p99', 'peak_memory_mb']:
+            if case[key] > old_case[key] * (1 + tolerance): # NaN never compares as greater so missing measurements are ignored
+                regressions.append(name + ': ' + key + ' rose from %.4f to %.4f' % (old_case[key], case[key]))
+    return regressions
+
+def printReport(benchmarks):
+    # prints a table of the benchmarks
+    print('Python cold start: %.3f s, %d cores' % (benchmarks['python_cold_start'], benchmarks['cpu_count']))
+    print('%-45s %10s %12s %12s %14s %10s %10s' % ('case', 'games/sec', 'turn p50 ms', 'turn p99 ms', '1st prompt ms', 'zygote ms', 'peak MB'))
+    for name, case in benchmarks['cases'].items():
+        print('%-45s %10.2f %12.2f %12.2f %14.2f %10.2f %10.1f' % (name, case['games_per_sec'], case['turn_latency_p50'] * 1000, case['turn_latency_p99'] * 1000, case['first_prompt_p50'] * 1000, case['spawn_latency_p50'] * 1000, max(case['peak_memory_mb'], case['peak_child_memory_mb'])))
+
+if __name__ == "__main__":
+    # running this script benchmarks the marker against the reference scripts and compares the results with benchmark_baseline.json (which is created the first time)
+    baseline_file = 'benchmark_baseline.json'
+    update_baseline = False # set to True to save this run as the new baseline (e.g. after a deliberate change to the marker)
+    benchmarks = runBenchmarks()
+    printReport(benchmarks)
+    if os.path.exists(baseline_file) and not update_baseline:
+        with open(baseline_file) as f:
+            regressions = compareBaseline(benchmarks, json.load(f))
+        for regression in regressions:
+            print('REGRESSION', regression)
+        if not regressions:
+            print('No regressions compared with', baseline_file)
+    else:
+        with open(baseline_file, 'w') as f:
+            json.dump(benchmarks, f, indent = 2)
+        print('Saved the baseline in', baseline_file)
@@ -0,0 +1,119 @@
+import os
+import json
+import hashlib
+import python_module3_marker
+import hangman_policy
+import hangman_parser
+import hangman_simulator
+import hangman_sprt
+from python_module3_marker import all_words, repeatedError
+from hangman_simulator import expectedOutcomes
+from hangman_sprt import sprtTest
+from hangman_results import ResultWriter, readResults, decodeHist
+
+def markerVersion():
+    """
+    Returns a SHA-256 of everything that decides how a game is played and marked: the source of python_module3_marker.py (solveGame and playTurn), hangman_policy.py (our strategy), hangman_parser.py (the text that playTurn sees), hangman_simulator.py (T_prob) and hangman_sprt.py (when a file has had enough games, see isComplete), and the word list. Any change to these makes the cached games out of date.
+    """
+
+    marker_hash = hashlib.sha256()
+    for module in [python_module3_marker, hangman_policy, hangman_parser, hangman_simulator, hangman_sprt]:
+        with open(module.__file__, 'rb') as f:
+            marker_hash.update(f.read())
+    marker_hash.update('\n'.join(all_words).encode())
+    return marker_hash.hexdigest()
+
+def isComplete(outcomes, no_repetitions, sprt = None, max_repeated_errors = None):
+    """
+    Checks if a file needs any more games, in the same way as the streamResults function in analyse_multiple_files.py decides when a file has finished.
+
+    Args:
+        outcomes (list): The objects returned by the solveGame function for the games of the file played so far (only the result of each game is used).
+        no_repetitions (int): The most games that are played for each file.
+        sprt (None or dict): The settings of the sequential probability ratio test (see hangman_sprt.py), or None if every game is played.
+        max_repeated_errors (None or int): The circuit breaker of the file (see the repeatedError function in python_module3_marker.py).
+
+    Returns (bool):
+        True if the file doesn't need any more games.
+
+    Raises:
+        None.
+    """
+
+    if len(outcomes) >= no_repetitions:
+        return True
+    if sprt != None and sprtTest(outcomes, expectedOutcomes(all_words)['T_prob'], sprt)[0] != None:
+        return True
+    return repeatedError(outcomes, max_repeated_errors) != None
+
+class GradingCache():
+    """
+    Saves the games played for each student's script so that running the marker again only plays scripts that are new or have changed. The games of a script are saved in cache_dir as <key>.jsonl (in the same form as results.jsonl, see hangman_results.py) where the key is a SHA-256 of the script's source, the markerVersion and the settings that change which games are played. The number of repetitions isn't part of the key so that more games can be added to a script that has already been played (see the top_up argument of the listOfFilesToTest function in analyse_multiple_files.py). The launcher and engine aren't part of the key either as they give exactly the same results.
+
+    Args:
+        cache_dir (str): The directory that the games are saved in (created if it doesn't exist).
+        sprt (None or dict): The settings of the sequential probability ratio test that the games are played with.
+        max_repeated_errors (None or int): The circuit breaker that the games are played with.
+        adaptive_timeouts (bool): If the games are played with adaptive timeouts.
+    """
+
+    def __init__(self, cache_dir, sprt = None, max_repeated_errors = None, adaptive_timeouts = False):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok = True)
+        self.settings = markerVersion() + json.dumps({'sprt': sprt, 'max_repeated_errors': max_repeated_errors, 'adaptive_timeouts': adaptive_timeouts}, sort_keys = True)
+        self.keys = {} # file name: key, so that a script that is changed during a run is still saved under the key that it was loaded with
+
+    def key(self, file_name):
+        if file_name not in self.keys:
+            file_hash = hashlib.sha256()
+            with open(file_name, 'rb') as f:
+                file_hash.update(f.read())
+            file_hash.update(self.settings.encode())
+            self.keys[file_name] = file_hash.hexdigest()
+        return self.keys[file_name]
+
+    def path(self, file_name):
+        return os.path.join(self.cache_dir, self.key(file_name) + '.jsonl')
+
+    def load(self, file_name):
+        """
+        Returns the records of the games saved for file_name (see the encodeGame function in hangman_results.py), an empty list if there are none. The file name of each record is set to file_name as the same script can be saved under a different name.
+        """
+
+        path = self.path(file_name)
+        if not os.path.exists(path):
+            return []
+        with open(path, 'rb+') as f: # a game that was only partly written (e.g. because of a crash) is cut off so that new games can be added after it
+            contents = f.read()
+            if not contents.endswith(b'\n'):
+                f.truncate(contents.rfind(b'\n') + 1)
+        records = list(readResults(path))
+        for record in records:
+            record['file'] = file_name
+        return records
+
+    def append(self, file_name, result, hist):
+        # adds one game to the games saved for file_name
+        with ResultWriter(self.path(file_name), 'a') as writer:
+            writer.write(file_name, result, hist)
+
+    def clear(self, file_name):
+        # throws away the games saved for file_name
+        if os.path.exists(self.path(file_name)):
+            os.remove(self.path(file_name))
+
+def markCached(record):
+    """
+    Returns a copy of a cached record with 'cached' added to the extra keys of its hist, so the games that were not played in this run can be told apart in results.jsonl.
+    """
+
+    record = dict(record)
+    record['extra'] = dict(record.get('extra', {}), cached = True)
+    return record
+
+def cachedGame(record):
+    """
+    Returns the (return result, hist) tuple of a cached record in the same form as the solveGame function, with hist marked as 'cached'.
+    """
+
+    return record['result'], decodeHist(markCached(record))
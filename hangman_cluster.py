@@ -0,0 +1,268 @@
+import os
+import sys
+import time
+import hashlib
+import importlib
+import tempfile
+import threading
+import collections
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+
+default_port = 6000
+heartbeat_interval = 2 # how often (in seconds) a worker tells the coordinator it is still alive
+heartbeat_timeout = 10 # how long (in seconds) the coordinator waits to hear from a worker before it is treated as dead
+
+def clusterKey():
+    """
+    Returns the key that the coordinator and the workers use to check that they are talking to each other. Everyone on the cluster must use the same key, which is taken from the HANGMAN_CLUSTER_KEY environment variable. There is no default as the messages are pickled, so anyone with the key can run code on the coordinator or the workers. Use a long random key and only give it to computers that you trust.
+
+    Raises:
+        ValueError if HANGMAN_CLUSTER_KEY is not set or is empty.
+    """
+
+    key = os.environ.get('HANGMAN_CLUSTER_KEY', '')
+    if key == '':
+        raise ValueError('set HANGMAN_CLUSTER_KEY to the same secret on the coordinator and every worker')
+    return key.encode()
+
+def functionName(func):
+    """
+    Returns the (module, name) that a worker imports func with. A function defined in the script that was run (e.g. playGames when analyse_multiple_files.py is run) belongs to the module __main__, which is a different script on the worker, so the name of the script's module is used instead.
+    """
+
+    module = func.__module__
+    if module == '__main__':
+        module = os.path.splitext(os.path.basename(sys.modules['__main__'].__file__))[0]
+    return module, func.__qualname__
+
+class _Worker():
+    # the coordinator's record of a connected worker
+    def __init__(self, connection, address, no_cores):
+        self.connection = connection
+        self.address = address
+        self.no_cores = no_cores
+        self.in_flight = {} # task_id: task that has been sent to this worker but not finished yet
+        self.files = set() # the student's scripts that have already been sent to this worker
+        self.alive = True
+
+class ClusterPool():
+    """
+    This stands in for a multiprocessing pool (see the createPool function in analyse_multiple_files.py) but plays the games on workers that can be on any number of computers. Each worker is started with `python hangman_cluster.py <coordinator host> <port>` and plays the tasks it is given in a pool of its own. As the streamResults function in analyse_multiple_files.py only uses apply_async, passing a ClusterPool as the pool of listOfFilesToTest (with the 'pexpect' engine) schedules, stops and writes out the games in exactly the same way as on one computer, so results.jsonl and results.csv are made in the same way.
+
+    The first argument of every task must be the path of a student's script. The script (and word_list.txt from the current directory) is sent to each worker the first time it needs it, so the workers don't need a copy of the student's scripts. A worker that disconnects or stops sending heartbeats is treated as dead and its unfinished tasks are given to the other workers. If every worker dies the tasks wait until a new worker connects.
+
+    Args:
+        address (tuple): The (host, port) to listen for workers on. The host should be the address of this computer on the network that the workers are on (the default only accepts workers on this computer), rather than '' which listens on every network.
+        min_workers (int): The number of workers to wait for before wait_for_workers returns.
+        word_list (str): The path of the word list that the student's scripts read, which is sent to the workers.
+
+    Raises:
+        ValueError if HANGMAN_CLUSTER_KEY is not set (see the clusterKey function).
+    """
+
+    def __init__(self, address = ('127.0.0.1', default_port), min_workers = 1, word_list = 'word_list.txt'):
+        authkey = clusterKey()
+        self.min_workers = min_workers
+        with open(word_list, 'rb') as f:
+            self.word_list = f.read()
+        self.listener = Listener(address, authkey = authkey)
+        self.lock = threading.Condition()
+        self.workers = []
+        self.tasks = {} # task_id: (func, args, callback, error_callback)
+        self.queue = collections.deque() # the tasks that haven't been sent to a worker yet
+        self.next_task_id = 0
+        self.closed = False
+        threading.Thread(target = self._accept, daemon = True).start()
+
+    @property
+    def no_processes(self):
+        # the number of processes of all the workers, which is what listOfFilesToTest should be given as no_cores
+        with self.lock:
+            return sum([worker.no_cores for worker in self.workers])
+
+    def wait_for_workers(self, timeout = None):
+        """
+        Waits until min_workers workers have connected, or timeout seconds. Returns the number of worker processes.
+        """
+
+        with self.lock:
+            self.lock.wait_for(lambda: len(self.workers) >= self.min_workers, timeout)
+        return self.no_processes
+
+    def _accept(self):
+        while not self.closed:
+            try:
+                connection = self.listener.accept()
+                hello = connection.recv()
+            except (OSError, EOFError, AuthenticationError):
+                if self.closed:
+                    return
+                continue # a worker with the wrong key or one that disconnected straight away
+            worker = _Worker(connection, self.listener.last_accepted, hello['no_cores'])
+            with self.lock:
+                self.workers.append(worker)
+                self.lock.notify_all()
+                self._dispatch()
+            threading.Thread(target = self._receive, args = (worker,), daemon = True).start()
+
+    def _send(self, worker, task_id):
+        # sends a task to a worker, along with the student's script if the worker doesn't have it yet (call with self.lock held)
+        func, args = self.tasks[task_id][:2]
+        files = {}
+        if not worker.files:
+            files['word_list.txt'] = self.word_list
+        if args[0] not in worker.files:
+            with open(args[0], 'rb') as f:
+                files[args[0]] = f.read()
+        worker.connection.send(('task', task_id, functionName(func), args, files))
+        worker.files.update(files)
+        worker.in_flight[task_id] = self.tasks[task_id]
+
+    def _dispatch(self):
+        # sends queued tasks to the workers with free processes, two tasks per process like streamResults (call with self.lock held)
+        while self.queue:
+            free_workers = [worker for worker in self.workers if worker.alive and len(worker.in_flight) < 2 * worker.no_cores]
+            if not free_workers:
+                return
+            worker = max(free_workers, key = lambda worker: 2 * worker.no_cores - len(worker.in_flight))
+            task_id = self.queue.popleft()
+            try:
+                self._send(worker, task_id)
+            except (OSError, EOFError): # the worker has died, which its receive thread will deal with
+                self.queue.appendleft(task_id)
+                worker.alive = False
+
+    def _receive(self, worker):
+        # receives the results of a worker and gives its tasks to the other workers if it dies
+        try:
+            while True:
+                if not worker.connection.poll(heartbeat_timeout):
+                    break
+                message = worker.connection.recv()
+                if message[0] == 'alive':
+                    continue
+                kind, task_id, value = message
+                with self.lock:
+                    task = worker.in_flight.pop(task_id, None)
+                    self.tasks.pop(task_id, None)
+                    self._dispatch()
+                if task == None:
+                    continue
+                if kind == 'result':
+                    task[2](value)
+                elif task[3] != None:
+                    task[3](value)
+        except (OSError, EOFError):
+            pass
+        worker.connection.close()
+        with self.lock:
+            worker.alive = False
+            self.workers.remove(worker)
+            self.queue.extendleft(reversed(list(worker.in_flight))) # replay the unfinished tasks first
+            worker.in_flight = {}
+            self._dispatch()
+
+    def apply_async(self, func, args = (), callback = None, error_callback = None):
+        """
+        Plays func(*args) on one of the workers and calls callback with the result (or error_callback with the error it raised) from a thread of the pool, in the same way as multiprocessing.Pool.apply_async. func must be importable on the workers (i.e. defined at the top level of a module).
+        """
+
+        with self.lock:
+            task_id = self.next_task_id
+            self.next_task_id += 1
+            self.tasks[task_id] = (func, args, callback, error_callback)
+            self.queue.append(task_id)
+            self._dispatch()
+
+    def close(self):
+        # stops accepting workers and disconnects the connected ones, which makes them stop
+        self.closed = True
+        self.listener.close()
+        with self.lock:
+            for worker in self.workers:
+                worker.connection.close()
+
+    def join(self):
+        pass
+
+def _localPath(work_dir, file_name, contents):
+    # where a student's script is saved on a worker, a directory per version so that a changed script with the same name doesn't overwrite a game that is being played
+    return os.path.join(work_dir, 'scripts', hashlib.sha256(contents).hexdigest()[:16], os.path.basename(file_name))
+
+def runWorker(address, no_cores = None, work_dir = None, retry_for = 60):
+    """
+    Connects to a coordinator (a ClusterPool) and plays the tasks it sends in a multiprocessing pool until the coordinator disconnects.
+
+    Args:
+        address (tuple): The (host, port) of the coordinator.
+        no_cores (None or int): The number of processes to play games in. The default of None uses all available cores.
+        work_dir (None or str): The directory that the student's scripts and word_list.txt are saved in and the games are played from. The default of None uses a new temporary directory.
+        retry_for (float): How many seconds to keep trying to connect to the coordinator for, so workers can be started before the coordinator.
+
+    Returns:
+        None.
+
+    Raises:
+        ConnectionRefusedError if the coordinator can't be reached within retry_for seconds. ValueError if HANGMAN_CLUSTER_KEY is not set (see the clusterKey function).
+    """
+
+    from analyse_multiple_files import createPool
+    authkey = clusterKey()
+    deadline = time.monotonic() + retry_for
+    while True:
+        try:
+            connection = Client(address, authkey = authkey)
+            break
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(1)
+    work_dir = work_dir if work_dir != None else tempfile.mkdtemp(prefix = 'hangman_worker_')
+    os.chdir(work_dir) # the student's scripts open word_list.txt from the current directory
+    no_processes = os.cpu_count() if no_cores == None else no_cores
+    pool = createPool(no_processes)
+    send_lock = threading.Lock()
+    local_paths = {} # the path of each student's script on the coordinator: the path of its copy on this worker
+
+    def send(message):
+        with send_lock:
+            try:
+                connection.send(message)
+            except (OSError, EOFError, ValueError): # the coordinator has gone, which the main loop will find out
+                pass
+
+    def heartbeat():
+        while not connection.closed:
+            send(('alive',))
+            time.sleep(heartbeat_interval)
+
+    send({'no_cores': no_processes})
+    threading.Thread(target = heartbeat, daemon = True).start()
+    try:
+        while True:
+            try:
+                message = connection.recv()
+            except (OSError, EOFError): # the coordinator has finished (or died)
+                break
+            _, task_id, (module, name), args, files = message
+            func = getattr(importlib.import_module(module), name)
+            for file_name, contents in files.items():
+                if file_name == 'word_list.txt':
+                    path = os.path.join(work_dir, 'word_list.txt')
+                else:
+                    path = _localPath(work_dir, file_name, contents)
+                    local_paths[file_name] = path
+                os.makedirs(os.path.dirname(path), exist_ok = True)
+                with open(path, 'wb') as f:
+                    f.write(contents)
+            args = (local_paths[args[0]],) + tuple(args[1:])
+            pool.apply_async(func, args, callback = lambda result, task_id = task_id: send(('result', task_id, result)), error_callback = lambda error, task_id = task_id: send(('error', task_id, error)))
+    finally:
+        connection.close()
+        pool.terminate()
+        pool.join()
+
+if __name__ == "__main__":
+    # running `python hangman_cluster.py <coordinator host> [port] [no_cores]` starts a worker that plays games for analyse_multiple_files.py (see cluster_address in it)
+    runWorker((sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else default_port), int(sys.argv[3]) if len(sys.argv) > 3 else None)
@@ -0,0 +1,193 @@
+import os
+import sys
+import ctypes
+import builtins
+import threading
+import traceback
+import importlib.util
+import pexpect
+from python_module3_marker import newGameState, playTurn
+
+prompt = 'Please enter your next guess: '
+
+class _GameOver(BaseException):
+    # raised inside the student's playGame to stop it once the game has been decided (BaseException so that `except Exception` in the student's script doesn't catch it)
+    pass
+
+class _Channel():
+    """
+    This stands in for the pty between the solver and a student's playGame function. Everything the student's code prints goes into buffer, and when it calls input() the solver reads buffer in the same way as child.expect(['Please enter your next guess: ', pexpect.EOF]) and answers with its next guess.
+    """
+
+    def __init__(self, hist):
+        self.buffer = ''
+        self.pending_lines = [] # guesses that have been sent but not yet read by input()
+        self.game_state = newGameState(hist)
+        self.result = None
+        self.finished = False
+        self.abandoned = False # set by the watchdog when the game has timed out
+        self.progress = threading.Event() # set every time the game stops for input or finishes so the watchdog knows it is still responding
+
+    def write(self, s):
+        if self.abandoned or self.finished: # the game has been decided so there is no need to let the student's code carry on
+            raise _GameOver()
+        self.buffer += s
+        return len(s)
+
+    def _expect(self, eof):
+        # looks for the prompt (or the end of the game if eof is True) and plays a turn. Returns False if neither was found.
+        idx = self.buffer.find(prompt)
+        if idx != -1:
+            bfr_txt, afr_txt = self.buffer[:idx], prompt
+            self.buffer = self.buffer[idx + len(prompt):]
+        elif eof:
+            bfr_txt, afr_txt = self.buffer, pexpect.EOF
+            self.buffer = ''
+        else:
+            return False
+        bfr_txt = " ".join(bfr_txt.strip().lower().split())
+        if afr_txt != pexpect.EOF:
+            afr_txt = " ".join(afr_txt.strip().lower().split())
+        finished, value = playTurn(self.game_state, bfr_txt, afr_txt)
+        if finished:
+            self.finish(value)
+        else:
+            self.pending_lines.append(value)
+            self.buffer += value + '\n' # the terminal echoes our guess back in the same way as a pty does
+        return True
+
+    def input(self, message = ''):
+        self.write(str(message))
+        self.progress.set()
+        while not self.pending_lines: # the script is waiting for a guess so play turns until we have one
+            if not self._expect(eof = False): # the script is waiting for input without asking for a guess which pexpect would time out on
+                self.finish('Expect error')
+        return self.pending_lines.pop(0)
+
+    def end(self):
+        # the script has ended so play out whatever it printed and then the end of the game
+        while not self.finished:
+            self._expect(eof = True)
+
+    def finish(self, result):
+        if not self.finished:
+            self.result = result
+            self.finished = True
+        self.progress.set()
+        raise _GameOver()
+
+class _ThreadStdout():
+    # sys.stdout is shared by all threads so this sends each thread's output to its own channel (if it has one)
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, s):
+        channel = getattr(_local, 'channel', None)
+        if channel is None:
+            return self.stream.write(s)
+        return channel.write(s)
+
+    def flush(self):
+        if getattr(_local, 'channel', None) is None:
+            self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+_local = threading.local()
+_original_input = builtins.input
+_student_code = {} # file path: the compiled code of each student's script, so it is only read and compiled once per process
+
+def _threadInput(*args):
+    channel = getattr(_local, 'channel', None)
+    if channel is None:
+        return _original_input(*args)
+    return channel.input(*args)
+
+def _redirect():
+    # installs the per thread input and stdout redirection (only once per process)
+    if not isinstance(sys.stdout, _ThreadStdout):
+        sys.stdout = _ThreadStdout(sys.stdout)
+        sys.stderr = _ThreadStdout(sys.stderr) # a pty mixes stderr in with stdout so tracebacks end up in the output
+        builtins.input = _threadInput
+
+def loadStudentModule(file_path):
+    """
+    Runs the student's hangman script as a new module, in the same way as `import module` in a new interpreter. The script is only read and compiled once per process, but it is run into a fresh module every time so that nothing the script keeps at module level (e.g. a set of guessed letters) carries over from one game to the next. Anything the script prints or asks for while it runs goes to the game of the calling thread, as it would in a new interpreter.
+
+    Args:
+        file_path (str): A string of a path to the student's hangman script.
+
+    Returns:
+        The new module.
+
+    Raises:
+        Any error raised while compiling or running the student's script.
+    """
+
+    file_path = os.path.abspath(file_path)
+    module_dir = os.path.dirname(file_path)
+    if module_dir not in sys.path:
+        sys.path.insert(0, module_dir)
+    if file_path not in _student_code: # a script that can't be compiled isn't saved so it fails in the same way every game
+        with open(file_path, 'rb') as f:
+            _student_code[file_path] = compile(f.read(), file_path, 'exec')
+    spec = importlib.util.spec_from_file_location(os.path.basename(file_path)[:-3], file_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    try:
+        exec(_student_code[file_path], module.__dict__)
+    except:
+        if sys.modules.get(spec.name) is module: # a game that was abandoned by the watchdog may still be running the script
+            del sys.modules[spec.name]
+        raise
+    return module
+
+def _playGame(file_path, word, channel):
+    # this is run in the game thread and mimics `python -c "import module; print(module.playGame(word))"`, including running the script so that the watchdog also covers a script that hangs while it is imported
+    _local.channel = channel
+    try:
+        try:
+            module = loadStudentModule(file_path)
+            print(module.playGame(word))
+        except (_GameOver, SystemExit):
+            pass
+        except BaseException: # the interpreter would print the traceback (e.g. of a script that can't be imported) and exit, which playTurn sees as a 'Return error'
+            channel.write(traceback.format_exc())
+        channel.end()
+    except _GameOver:
+        pass
+    finally:
+        _local.channel = None
+
+def solveGameWordDirect(file_path, word, timeout = 1):
+    """
+    This plays a game in the same way as the solveGameWord function in python_module3_marker.py except that instead of starting a new Python interpreter for every game the student's script is compiled once per process, run into a fresh module and playGame(word) is called directly. input() and print() are redirected to the solver so there is no subprocess or pty at all, which makes it hundreds of times faster. The result is the same as solveGameWord's as long as the script keeps its state in itself: anything kept in other modules that it imports (e.g. the state of the random module, or a helper module of the student's) is shared by all the games played by a process, whereas a new interpreter would start it afresh.
+
+    The game runs in its own thread while this thread acts as a watchdog. The student's script is run in the game thread too, so a script that fails to import gives the same 'Return error' as the traceback and exit of a new interpreter would, and anything it prints or asks for while it is imported is part of the game. If the game (or the import) doesn't stop for input or finish within timeout seconds (like child.timeout in solveGame) then 'Expect error' is returned and the game thread is stopped by raising an exception in it. A game that is stuck in a blocking call can't be stopped until the call returns, but as the thread is a daemon it won't stop the worker from exiting.
+
+    Args:
+        file_path (str): A string of a path to the student's hangman script which must have a playGame(word) function.
+        word (str): The word that the game should use.
+        timeout (float): The number of seconds to wait for the game to ask for a guess or end.
+
+    Returns:
+        (return result (bool or str), hist (dict)) (tup): in the same form as the solveGameWord function.
+
+    Raises:
+        All errors should be dealt with try and exception statements so that an error string is returned instead of a Python Error being raised.
+    """
+
+    hist = {'word': word, 'guess_hist': [], 'word_progress_hist': [], 'remaining_words_hist': [], 'letters_by_occurence_hist': []}
+    _redirect()
+    channel = _Channel(hist)
+    game_thread = threading.Thread(target = _playGame, args = (file_path, word, channel), daemon = True)
+    game_thread.start()
+    while not channel.finished:
+        if not channel.progress.wait(timeout): # the game has stopped responding
+            channel.abandoned = True
+            ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(game_thread.ident), ctypes.py_object(_GameOver)) # stop the game thread as soon as it runs any more Python code
+            return 'Expect error', hist
+        channel.progress.clear()
+    game_thread.join()
+    return channel.result, hist
@@ -0,0 +1,178 @@
+import time
+import codecs
+import pexpect
+
+prompt = b'Please enter your next guess: '
+markers = {'won': 'congratulations you win', 'lost': 'you lose'} # what playTurn looks for in the text before the end of the game
+
+class OutputParser():
+    """
+    This reads the output of a student's script as it arrives and keeps only what our strategy needs, instead of holding and rescanning everything that has been printed like child.expect and child.before do. A script that prints a large gallows or the whole guess history every turn then costs the same to parse per byte however much it has printed, and uses a bounded amount of memory.
+
+    Each turn the raw bytes are searched for the prompt with a window of one read plus the length of the prompt, and the bytes before it are decoded incrementally and normalised in the same way as solveGame always has (lower case with whitespace collapsed and stripped). Only the last window characters of the normalised text are kept (more if the starred word could be longer), along with the number of stars, the characters seen and whether the win or lose text has been seen, which is everything that the playTurn function in python_module3_marker.py looks at. The before method turns these back into text that playTurn treats in exactly the same way as the whole output, so the results and error codes are the same as before.
+
+    Args:
+        window (int): The number of normalised characters that are kept from each turn.
+    """
+
+    def __init__(self, window = 256):
+        self.window = max(window, max([len(marker) for marker in markers.values()]))
+        self.no_of_letters = None # the number of stars before the first prompt, which is what playTurn takes as the length of the word
+        self.raw = b'' # bytes that may be the start of the prompt
+        self.pending = b'' # bytes that arrived after the prompt, which belong to the next turn
+        self.ended = False # the script has ended
+        self._newTurn()
+
+    def _newTurn(self):
+        self.stop = None # 'prompt' or 'eof' once the script has stopped
+        self.first_prompt = False # True if this turn ended on the first prompt
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.decode_error = False
+        self.tail = '' # the end of the normalised text
+        self.started = False # some text has been kept (so whitespace in front of the next text becomes a space)
+        self.pending_space = False # the last text ended with whitespace
+        self.no_stars = 0
+        self.chars = set()
+        self.seen = {name: False for name in markers}
+
+    def _addText(self, text):
+        # normalises text in the same way as " ".join(text.strip().lower().split()) as if it had all arrived at once
+        text = text.lower()
+        words = text.split()
+        if not words:
+            if text:
+                self.pending_space = True
+            return
+        piece = ' '.join(words)
+        if self.started and (self.pending_space or text[0].isspace()):
+            piece = ' ' + piece
+        self.started = True
+        self.pending_space = text[-1].isspace()
+        self.no_stars += piece.count('*')
+        self.chars.update(piece)
+        self.tail += piece
+        for name, marker in markers.items():
+            if not self.seen[name] and marker in self.tail[-(len(piece) + len(marker) - 1):]: # a marker can be split between reads
+                self.seen[name] = True
+        keep = max(self.window, self.no_stars, self.no_of_letters or 0) # enough for the starred word, whichever way playTurn works out its length
+        if len(self.tail) > 2 * keep:
+            self.tail = self.tail[-keep:]
+
+    def _addBytes(self, data):
+        if self.decode_error or not data:
+            return
+        try:
+            self._addText(self.decoder.decode(data))
+        except UnicodeDecodeError: # the same as child.before.decode() failing, which is only reported once the script has stopped
+            self.decode_error = True
+
+    def _finish(self, stop):
+        try:
+            self.decoder.decode(b'', final = True) # a character that was cut off is a decode error
+        except UnicodeDecodeError:
+            self.decode_error = True
+        self.stop = stop
+        if stop == 'prompt' and self.no_of_letters == None:
+            self.first_prompt = True
+            self.no_of_letters = self.no_stars
+
+    def _scan(self):
+        idx = self.raw.find(prompt)
+        if idx != -1:
+            self._addBytes(self.raw[:idx])
+            self.pending = self.raw[idx + len(prompt):] + self.pending
+            self.raw = b''
+            self._finish('prompt')
+        elif self.ended:
+            self._addBytes(self.raw)
+            self.raw = b''
+            self._finish('eof')
+        else:
+            cut = max(0, len(self.raw) - len(prompt) + 1) # the end might be the start of the prompt
+            self._addBytes(self.raw[:cut])
+            self.raw = self.raw[cut:]
+
+    def feed(self, data):
+        """
+        Adds bytes read from the script. Anything that arrives after the script has stopped is kept for the next turn.
+        """
+
+        if self.stop != None:
+            self.pending += data
+            return
+        self.raw += data
+        self._scan()
+
+    def end(self):
+        """
+        Records that the script has ended (i.e. pexpect.EOF).
+        """
+
+        self.ended = True
+        if self.stop == None:
+            self._scan()
+
+    def nextTurn(self):
+        """
+        Starts reading the next turn, after the script has stopped and we have answered.
+        """
+
+        if self.stop == None:
+            return
+        self._newTurn()
+        self.raw, self.pending = self.pending, b''
+        self._scan()
+
+    def before(self):
+        """
+        Returns text that the playTurn function treats in exactly the same way as the whole of the lower case and whitespace normalised text that the script printed before it stopped (i.e. bfr_txt in solveGame). This is the end of that text except in two cases: at the end of the game only the win or lose text matters, and if there were no stars before the first prompt playTurn uses the whole text as the word progress, which is replaced by the characters it contained.
+
+        Raises:
+            UnicodeDecodeError if the text could not be decoded.
+        """
+
+        if self.decode_error:
+            raise UnicodeDecodeError('utf-8', b'', 0, 0, 'the output of the script could not be decoded')
+        if self.stop == 'eof':
+            for name, marker in markers.items():
+                if self.seen[name]:
+                    return marker
+            return self.tail
+        if self.no_of_letters == 0:
+            return ''.join(sorted(self.chars))
+        if self.first_prompt: # playTurn counts all of the stars to find the length of the word
+            return '*' * (self.no_stars - self.tail.count('*')) + self.tail
+        return self.tail
+
+    def after(self):
+        """
+        Returns the lower case and whitespace normalised text that the script stopped on (i.e. afr_txt in solveGame), or pexpect.EOF if it ended.
+        """
+
+        if self.stop == 'eof':
+            return pexpect.EOF
+        return " ".join(prompt.decode().strip().lower().split())
+
+def expectStop(child, parser, timeout):
+    """
+    Reads from a pexpect child with parser until the script asks for the next guess or ends, in the same way as child.expect(['Please enter your next guess: ', pexpect.EOF], timeout = timeout).
+
+    Args:
+        child: The pexpect child connected to the student's script.
+        parser (OutputParser): The parser of this game.
+        timeout (float): The number of seconds to wait.
+
+    Raises:
+        pexpect.TIMEOUT if the script doesn't stop within the timeout.
+    """
+
+    parser.nextTurn()
+    deadline = time.monotonic() + timeout
+    while parser.stop == None:
+        remaining = deadline - time.monotonic()
+        if remaining < 0:
+            raise pexpect.TIMEOUT('Timeout exceeded.')
+        try:
+            parser.feed(child.read_nonblocking(child.maxread, remaining))
+        except pexpect.EOF:
+            parser.end()
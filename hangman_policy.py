@@ -0,0 +1,133 @@
+all_letters = 'abcdefghijklmnopqrstuvwxyz'
+vowels = 'aeiouy'
+
+class Policy():
+    """
+    This is our strategy (see the solveGame function in python_module3_marker.py) compiled into lookup tables so that each turn is a couple of dictionary lookups instead of filtering the word list and counting letters every time.
+
+    The words are indexed with bitsets (Python ints where bit i is set if word i matches), one for each word length and one for each (position, letter) pair. The remaining words are then the AND of the bitsets of every letter that has been revealed, and the letters_by_occurence of each set of remaining words is worked out once and stored in a table.
+
+    Args:
+        words (list(str)): The word list that the strategy is using.
+    """
+
+    def __init__(self, words):
+        self.words = words
+        self.length_masks = {} # word length: bitset of the words with that length
+        self.position_masks = {} # (position, letter): bitset of the words with that letter in that position
+        for idx, word in enumerate(words):
+            self.length_masks[len(word)] = self.length_masks.get(len(word), 0) | (1 << idx)
+            for position, letter in enumerate(word):
+                self.position_masks[(position, letter)] = self.position_masks.get((position, letter), 0) | (1 << idx)
+        self.pattern_masks = {} # word_progress: bitset of the words that match the revealed letters
+        self.table = {} # bitset of the remaining words: (remaining_words (list(str)), letters_by_occurence (list(tup)))
+        for word in words: # play every word so that every state that a correctly written game can reach is in the table
+            self._playWord(word)
+
+    def patternMask(self, word_progress):
+        """
+        Returns the bitset of the words that have the revealed letters of word_progress in the same places (the length of the words is not checked).
+        """
+
+        try:
+            return self.pattern_masks[word_progress]
+        except KeyError:
+            mask = -1 # all bits set
+            for idx in range(len(word_progress)):
+                if word_progress[idx] != '*':
+                    mask &= self.position_masks.get((idx, word_progress[idx]), 0)
+            self.pattern_masks[word_progress] = mask
+            return mask
+
+    def lookup(self, mask):
+        """
+        Returns (remaining_words (list(str)), letters_by_occurence (list(tup))) for the bitset of remaining words. These are the same as what the solveGame function used to calculate every turn and are shared between turns so they must not be changed.
+        """
+
+        try:
+            return self.table[mask]
+        except KeyError:
+            remaining_words = [self.words[idx] for idx in range(len(self.words)) if mask >> idx & 1]
+            letter_occurences = {letter: 0 for letter in all_letters}
+            for word in remaining_words:
+                for letter in word:
+                    letter_occurences[letter] += 1
+            letters_by_occurence = sorted(letter_occurences.items(), key = lambda kv: kv[1], reverse = True)
+            self.table[mask] = (remaining_words, letters_by_occurence)
+            return self.table[mask]
+
+    def _playWord(self, word):
+        # plays our strategy against a correctly written game using word so that the states it reaches are compiled into the table
+        mask = self.length_masks[len(word)]
+        self.lookup(mask)
+        word_progress = '*' * len(word)
+        vowel_list = list(vowels)
+        no_wrong_guesses = 0
+        while '*' in word_progress and no_wrong_guesses < 7:
+            if word_progress.count('*') == len(word_progress):
+                if not vowel_list:
+                    return
+                guess = vowel_list.pop(0)
+            else:
+                mask &= self.patternMask(word_progress)
+                for letter, _ in self.lookup(mask)[1]:
+                    if letter not in word_progress:
+                        guess = letter
+                        break
+            if guess in word:
+                word_progress = ''.join([word[idx] if word[idx] == guess else word_progress[idx] for idx in range(len(word))])
+            else:
+                no_wrong_guesses += 1
+
+_policy = None # the policy used by this process
+
+def getPolicy(words):
+    """
+    Returns the policy for words, compiling it if this process doesn't already have it (e.g. from setPolicy).
+    """
+
+    global _policy
+    if _policy is None or (_policy.words is not words and _policy.words != words):
+        _policy = Policy(words)
+    return _policy
+
+def setPolicy(policy):
+    """
+    Sets the policy used by this process. This is used as the initializer of a multiprocessing pool so that the policy is compiled once by the parent and handed to every worker instead of every worker compiling its own (with the default fork start method the workers share the parent's copy in memory).
+    """
+
+    global _policy
+    _policy = policy
+
+def replayHist(word_progress_hist, words, no_of_letters = None):
+    """
+    Rebuilds the remaining_words_hist and letters_by_occurence_hist of a game from its word_progress_hist, as our strategy is deterministic given the word progress it saw.
+
+    Args:
+        word_progress_hist (list(str)): The word_progress_hist of the game.
+        words (list(str)): The word list that the strategy was using.
+        no_of_letters (None or int): The number of stars the game showed before the first guess. The default of None uses the length of the first word progress, which is the same for any correctly written game.
+
+    Returns:
+        (remaining_words_hist (list(list(str))), letters_by_occurence_hist (list(list(tup)))) (tup): the same as in the hist returned by solveGame.
+
+    Raises:
+        None.
+    """
+
+    remaining_words_hist = []
+    letters_by_occurence_hist = []
+    if not word_progress_hist:
+        return remaining_words_hist, letters_by_occurence_hist
+    policy = getPolicy(words)
+    if no_of_letters == None:
+        no_of_letters = len(word_progress_hist[0])
+    mask = policy.length_masks.get(no_of_letters, 0)
+    remaining_words_hist.append(policy.lookup(mask)[0])
+    for word_progress in word_progress_hist:
+        if word_progress.count('*') != len(word_progress):
+            mask &= policy.patternMask(word_progress)
+            remaining_words, letters_by_occurence = policy.lookup(mask)
+            remaining_words_hist.append(remaining_words)
+            letters_by_occurence_hist.append(letters_by_occurence)
+    return remaining_words_hist, letters_by_occurence_hist
@@ -0,0 +1,104 @@
+import json
+from python_module3_marker import all_words
+from hangman_policy import getPolicy
+
+hist_keys = ['guess_hist', 'word_progress_hist', 'remaining_words_hist', 'letters_by_occurence_hist'] # the keys of hist that are encoded, anything else in hist is stored as it is
+
+_word_idx = {word: idx for idx, word in enumerate(all_words)}
+
+def encodeGame(file_name, result, hist):
+    """
+    Encodes one game returned by solveGame as a compact dictionary that can be written as a single line of JSON. The remaining words of each turn are stored as a bitset of all_words (written in hex) instead of a list of words, the guesses are stored as small ints (0 for 'a' to 25 for 'z') and the letters_by_occurence_hist is not stored at all as it can be worked out from the remaining words (see the decodeHist function).
+
+    Args:
+        file_name (str): The student's script that was played.
+        result (bool or str): The result returned by solveGame.
+        hist (dict): The hist returned by solveGame.
+
+    Returns (dict):
+        file (str): file_name. result (bool or str): result. guesses (list(int)): the guesses. progress (list(str)): the word_progress_hist. remaining (list(str)): the bitsets of the remaining_words_hist in hex. extra (dict): any other keys of hist (e.g. 'skipped'), only if there are some.
+
+    Raises:
+        None.
+    """
+
+    record = {'file': file_name, 'result': result, 'guesses': [ord(guess) - ord('a') for guess in hist['guess_hist']], 'progress': hist['word_progress_hist'], 'remaining': []}
+    for remaining_words in hist['remaining_words_hist']:
+        mask = 0
+        for word in remaining_words:
+            mask |= 1 << _word_idx[word]
+        record['remaining'].append(format(mask, 'x'))
+    extra = {key: value for key, value in hist.items() if key not in hist_keys}
+    if extra:
+        record['extra'] = extra
+    return record
+
+def decodeHist(record):
+    """
+    Rebuilds the hist returned by solveGame from a record made by the encodeGame function.
+
+    Args:
+        record (dict): A record made by the encodeGame function (e.g. from the readResults function).
+
+    Returns (dict):
+        The hist, in the same form as the one returned by solveGame.
+
+    Raises:
+        None.
+    """
+
+    policy = getPolicy(all_words)
+    masks = [int(mask, 16) for mask in record['remaining']]
+    hist = {'guess_hist': [chr(guess + ord('a')) for guess in record['guesses']], 'word_progress_hist': record['progress'], 'remaining_words_hist': [policy.lookup(mask)[0] for mask in masks], 'letters_by_occurence_hist': [policy.lookup(mask)[1] for mask in masks[1:]]} # the first remaining words are all the words of the right length, and every turn after that has its own letters_by_occurence
+    hist.update(record.get('extra', {}))
+    return hist
+
+class ResultWriter():
+    """
+    Appends each game to a JSON lines file (one encoded game per line) as soon as it has been played, so the results of a run never have to be held in memory all at once and a crash only loses the games that were being played.
+
+    Args:
+        path (str): The path of the file to write to.
+        mode (str): 'w' (default) starts a new file and 'a' adds to an existing one.
+    """
+
+    def __init__(self, path, mode = 'w'):
+        self.f = open(path, mode)
+
+    def write(self, file_name, result, hist):
+        self.writeRecord(encodeGame(file_name, result, hist))
+
+    def writeRecord(self, record):
+        # writes a game that has already been encoded (e.g. one read back with readResults)
+        self.f.write(json.dumps(record) + '\n')
+        self.f.flush() # so the game is saved even if the run crashes
+
+    def close(self):
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def readResults(path):
+    """
+    Reads the games saved by a ResultWriter one at a time, so the file doesn't have to be loaded all at once. Use the decodeHist function to get the full hist of a game.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns (generator):
+        Yields the record of each game (see the encodeGame function), in the order they were played. A last line that was only partly written (e.g. because of a crash) is ignored.
+
+    Raises:
+        None.
+    """
+
+    with open(path) as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                return
@@ -0,0 +1,93 @@
+import csv
+import pexpect
+from python_module3_marker import all_words, newGameState, playTurn
+
+def simulateGame(word, max_wrong_guesses = 7):
+    """
+    This plays our strategy (exactly the same playTurn function as solveGame) against a reference hangman game that is written according to the student's instructions, without running any other script. As the strategy is deterministic this is exactly what should happen when a correctly written student's script picks word.
+
+    Args:
+        word (str): The word that the reference game uses.
+        max_wrong_guesses (int): The number of wrong guesses before the game is lost.
+
+    Returns:
+        (return result (bool or str), hist (dict)) (tup): the same as the solveGame function.
+
+    Raises:
+        None.
+    """
+
+    hist = {'guess_hist': [], 'word_progress_hist': [], 'remaining_words_hist': [], 'letters_by_occurence_hist': []}
+    game_state = newGameState(hist)
+    word_progress = '*' * len(word)
+    no_wrong_guesses = 0
+    while True:
+        if '*' not in word_progress:
+            return playTurn(game_state, 'congratulations you win', pexpect.EOF)[1], hist
+        if no_wrong_guesses >= max_wrong_guesses:
+            return playTurn(game_state, 'you lose', pexpect.EOF)[1], hist
+        finished, value = playTurn(game_state, word_progress, 'please enter your next guess:')
+        if finished:
+            return value, hist
+        if value in word:
+            word_progress = ''.join([word[idx] if word[idx] == value else word_progress[idx] for idx in range(len(word))])
+        else:
+            no_wrong_guesses += 1
+
+_expected = {} # the expected outcomes are only worked out once per word list
+
+def expectedOutcomes(words = all_words):
+    """
+    Plays our strategy against every word in words with the simulateGame function. If a correctly written student's script picks its word from words using a uniform distribution then T_prob is the exact probability that our strategy wins a game.
+
+    Args:
+        words (list(str)): The word list that the student's scripts should be using (i.e. word_list.txt).
+
+    Returns:
+        A dictionary with the following keys. T_prob (float): the exact probability that our strategy wins a game. word_results (dict): the (return result, hist) tuple returned by simulateGame for each word. trajectories (dict): the words that each (return result, guess_hist, word_progress_hist) tuple can come from, which is used by the matchTrajectory function.
+
+    Raises:
+        None.
+    """
+
+    key = tuple(words)
+    if key not in _expected:
+        word_results = {word: simulateGame(word) for word in words}
+        trajectories = {}
+        for word, (result, hist) in word_results.items():
+            trajectories.setdefault((result, tuple(hist['guess_hist']), tuple(hist['word_progress_hist'])), []).append(word)
+        T_prob = sum([result == True for result, _ in word_results.values()]) / len(words)
+        _expected[key] = {'T_prob': T_prob, 'word_results': word_results, 'trajectories': trajectories}
+    return _expected[key]
+
+def matchTrajectory(result, hist, words = all_words):
+    """
+    Checks a game played against a student's script against what our strategy does against a correctly written game for every word. A correctly written script always plays exactly the same game as one of the words, so an unmatched game shows that something is wrong with the script (e.g. a different word list or not taking a life for a wrong guess) even if the number of wins looks fine.
+
+    Args:
+        result (bool or str): The result returned by solveGame.
+        hist (dict): The hist returned by solveGame.
+        words (list(str)): The word list that the student's scripts should be using.
+
+    Returns (list(str)):
+        The words that would have given exactly the same game. This is empty if the game could not have come from a correctly written script.
+
+    Raises:
+        None.
+    """
+
+    trajectories = expectedOutcomes(words)['trajectories']
+    return trajectories.get((result, tuple(hist['guess_hist']), tuple(hist['word_progress_hist'])), [])
+
+if __name__ == "__main__":
+    # running this script prints the exact probability that our strategy wins and saves the result of every word in expected_outcomes.csv
+    with open('word_list.txt') as f:
+        words = [line.strip() for line in f if line.strip()]
+    expected = expectedOutcomes(words)
+    print('T_prob =', expected['T_prob'])
+    with open('expected_outcomes.csv', 'w') as out:
+        csv_out = csv.writer(out, delimiter = ';')
+        csv_out.writerow(['word', 'Result', 'No. guesses', 'Guesses'])
+        for word in words:
+            result, hist = expected['word_results'][word]
+            csv_out.writerow([word, result, len(hist['guess_hist']), ''.join(hist['guess_hist'])])
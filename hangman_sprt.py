@@ -0,0 +1,91 @@
+import math
+
+# the default settings of the sequential probability ratio test. alpha (float): the probability that the test fails a correctly written script, split equally between the one-sided tests. beta (float): the probability of passing a script whose win rate is delta away from T_prob. delta (float): how far a script's win rate has to be from T_prob before it should fail. With T_prob = 0.78 and a cap of 20 games these fail 0.49% of correctly written scripts (including the 3 standard deviation window used when the cap is reached, see the operatingCharacteristics function) compared with 0.54% for always playing 20 games, and a correct script needs 5.9 games on average
+default_sprt = {'alpha': 0.003, 'beta': 0.1, 'delta': 0.45}
+
+def _alternatives(T_prob, delta):
+    # the win rates tested against. A side is left out if it isn't a valid win rate (e.g. T_prob + delta >= 1), as a log-likelihood ratio against a win rate of 1 fails any script that hasn't lost yet
+    return [p for p in [T_prob - delta, T_prob + delta] if 0 < p < 1]
+
+def sprtTest(results, T_prob, sprt = default_sprt):
+    """
+    This is a sequential probability ratio test (SPRT) of whether a student's script wins as often as a correctly written script should (T_prob), using the games that have been played so far. One-sided tests are used against a win rate of T_prob - delta and T_prob + delta (so that a script that wins too often, e.g. it doesn't pick its word uniformly, can fail as well as one that wins too rarely), leaving out a side that isn't between 0 and 1. With the default settings T_prob + delta is more than 1 so only the test against winning too rarely is used. alpha is split equally between the tests so that together they fail a correctly written script with probability alpha. After every game the log-likelihood ratio of each test is compared with
+        A = log( (1 - beta) / (alpha / no_tests) ) and B = log( beta / (1 - alpha / no_tests) )
+    and the script fails as soon as any ratio is at least A and passes as soon as all of them are at most B. Otherwise more games are needed.
+
+    Args:
+        results (list): The objects returned by the solveGame function for the games played so far.
+        T_prob (float): The probability that our strategy wins against a correctly written script.
+        sprt (dict): The settings of the test (see default_sprt).
+
+    Returns:
+        (decision (str or None), statistic (float)) (tup): decision is 'pass', 'fail', 'error' (if any of the games ended with an error, as the script will be marked as an error whatever happens in the rest of the games), or None if more games are needed. statistic is the largest of the log-likelihood ratios (NaN for 'error').
+
+    Raises:
+        None.
+    """
+
+    if any([result[0] not in [True, False] for result in results]):
+        return 'error', float('nan')
+    no_wins = sum([result[0] == True for result in results])
+    no_losses = len(results) - no_wins
+    alternatives = _alternatives(T_prob, sprt['delta'])
+    if not alternatives: # there is nothing to test against
+        return None, float('nan')
+    alpha = sprt['alpha'] / len(alternatives)
+    statistic = max([no_wins * math.log(p / T_prob) + no_losses * math.log((1 - p) / (1 - T_prob)) for p in alternatives])
+    if statistic >= math.log((1 - sprt['beta']) / alpha):
+        return 'fail', statistic
+    elif statistic <= math.log(sprt['beta'] / (1 - alpha)):
+        return 'pass', statistic
+    return None, statistic
+
+def operatingCharacteristics(win_prob, T_prob, no_repetitions, sprt = default_sprt):
+    """
+    Works out exactly how often a script that wins each game with probability win_prob fails and how many games it needs, when it is played until sprtTest decides or no_repetitions games have been played. A script that reaches no_repetitions games without a decision is marked in the same way as analyse_multiple_files.py always did, passing if its number of wins is within 3 standard deviations of the mean (see the getStatistics function in analyse_multiple_files.py). With win_prob = T_prob the probability of failing is the false fail rate of the whole procedure.
+
+    Args:
+        win_prob (float): The probability that our strategy wins a game against the script.
+        T_prob (float): The probability that our strategy wins against a correctly written script.
+        no_repetitions (int): The most games that are played.
+        sprt (dict): The settings of the test (see default_sprt).
+
+    Returns (dict):
+        fail (float): the probability that the script fails. fail_at_cap (float): the part of fail that comes from the 3 standard deviation window. mean_games (float): the expected number of games played.
+
+    Raises:
+        None.
+    """
+
+    mu = no_repetitions * T_prob
+    sigma3 = 3 * math.sqrt(no_repetitions * T_prob * (1 - T_prob))
+    undecided = {0: 1.0} # number of wins: probability, of the scripts that are still being played
+    fail, fail_at_cap, mean_games = 0, 0, 0
+    for no_games in range(1, no_repetitions + 1):
+        played = {}
+        for no_wins, prob in undecided.items():
+            played[no_wins + 1] = played.get(no_wins + 1, 0) + prob * win_prob
+            played[no_wins] = played.get(no_wins, 0) + prob * (1 - win_prob)
+        undecided = {}
+        for no_wins, prob in played.items():
+            decision = sprtTest([(True,)] * no_wins + [(False,)] * (no_games - no_wins), T_prob, sprt)[0]
+            if decision == None and no_games == no_repetitions:
+                decision = 'pass' if mu - sigma3 < no_wins < mu + sigma3 else 'fail'
+                if decision == 'fail':
+                    fail_at_cap += prob
+            if decision == None:
+                undecided[no_wins] = prob
+                continue
+            mean_games += prob * no_games
+            if decision == 'fail':
+                fail += prob
+    return {'fail': fail, 'fail_at_cap': fail_at_cap, 'mean_games': mean_games}
+
+if __name__ == "__main__":
+    # running this script prints how often scripts with different win rates fail with the default settings and 20 games, and how many games they need
+    from python_module3_marker import all_words
+    from hangman_simulator import expectedOutcomes
+    T_prob = expectedOutcomes(all_words)['T_prob']
+    for win_prob in [T_prob, 0.6, 0.5, T_prob - default_sprt['delta'], 0.2, 0]:
+        characteristics = operatingCharacteristics(win_prob, T_prob, 20)
+        print('Win rate %.2f: fails %.2f%% of the time (%.2f%% at the cap) after %.1f games on average' % (win_prob, 100 * characteristics['fail'], 100 * characteristics['fail_at_cap'], characteristics['mean_games']))
@@ -0,0 +1,77 @@
+import time
+
+phases = ['spawn', 'expect', 'decode', 'guess', 'send', 'total'] # spawn: starting the script. expect: waiting for the script to ask for a guess or end. decode: getting the normalised before and after text from the parser (the output is decoded as it arrives, so most of the decoding is part of expect). guess: working out the next guess with playTurn. send: sending the guess. total: the whole game
+turn_phases = ['expect', 'decode', 'guess', 'send'] # the phases that happen every turn (the others happen once per game)
+bucket_bounds = [0.001, 0.01, 0.1, 1] # the upper bounds in seconds of the buckets of the histograms (plus one more bucket for anything longer)
+bucket_names = ['< 1 ms', '1-10 ms', '10-100 ms', '0.1-1 s', '>= 1 s']
+
+def newTimings():
+    """
+    Creates the timing breakdown of one game, which solveGame keeps in hist['timings']. The turn phases are lists with one entry for each turn (a turn that ends the game has no send) and the others are a single number of seconds (None until they have been timed).
+    """
+
+    return {phase: [] if phase in turn_phases else None for phase in phases}
+
+def recordTiming(timings, phase, start, file_path = None, timing_hook = None):
+    """
+    Records how long a phase of a game took, from start (a time.monotonic() time) until now.
+
+    Args:
+        timings (dict): The timing breakdown of the game created by newTimings.
+        phase (str): One of phases.
+        start (float): When the phase started, from time.monotonic().
+        file_path (None or str): The student's script being played, which is passed on to timing_hook.
+        timing_hook (None or callable): If not None this is called as timing_hook(file_path, phase, start, duration) so that an external profiler can follow the games as they are played.
+
+    Returns (float):
+        How many seconds the phase took.
+    """
+
+    duration = time.monotonic() - start
+    if phase in turn_phases:
+        timings[phase].append(round(duration, 6)) # microseconds are plenty and keep results.jsonl small
+    else:
+        timings[phase] = round(duration, 6)
+    if timing_hook != None:
+        timing_hook(file_path, phase, start, duration)
+    return duration
+
+def newHistograms():
+    """
+    Creates a histogram of each phase, which addTimings adds the timing breakdowns of games to. Each histogram has the number of timings (count), their total and longest in seconds, and how many fall in each of bucket_bounds.
+    """
+
+    return {phase: {'count': 0, 'total': 0, 'max': 0, 'buckets': [0] * (len(bucket_bounds) + 1)} for phase in phases}
+
+def addTimings(histograms, timings):
+    """
+    Adds the timing breakdown of one game (hist['timings']) to the histograms created by newHistograms.
+    """
+
+    for phase in phases:
+        durations = timings.get(phase)
+        if durations == None:
+            continue
+        if phase not in turn_phases:
+            durations = [durations]
+        histogram = histograms[phase]
+        for duration in durations:
+            histogram['count'] += 1
+            histogram['total'] += duration
+            histogram['max'] = max(histogram['max'], duration)
+            bucket = 0
+            while bucket < len(bucket_bounds) and duration >= bucket_bounds[bucket]:
+                bucket += 1
+            histogram['buckets'][bucket] += 1
+
+def histogramRows(name, histograms):
+    """
+    Returns one row for each phase of the histograms (that has any timings) to be written to a CSV file: name, the phase, the number of timings, the total in seconds, the mean and longest in milliseconds, and the number of timings in each bucket (see bucket_names).
+    """
+
+    rows = []
+    for phase in phases:
+        histogram = histograms[phase]
+        if histogram['count'] > 0:
+            rows.append([name, phase, histogram['count'], round(histogram['total'], 3), round(1000 * histogram['total'] / histogram['count'], 3), round(1000 * histogram['max'], 3)] + histogram['buckets'])
+    return rows
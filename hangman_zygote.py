@@ -0,0 +1,204 @@
+import os
+import sys
+import time
+import json
+import signal
+import socket
+import subprocess
+from pexpect import fdpexpect
+
+# modules that are imported once in the zygote so that the forked games don't have to import them again. These are the modules that the student's hangman scripts tend to use.
+preload_modules = ['random', 're', 'string', 'time', 'io', 'traceback', 'runpy', 'atexit']
+
+class ZygoteChild(fdpexpect.fdspawn):
+    """
+    This is a pexpect child that talks to a hangman game forked by the zygote through the pty file descriptor that the zygote handed back. It behaves like the object returned by pexpect.spawn so solveGame can use it without knowing where it came from.
+    """
+
+    def __init__(self, fd, pid):
+        fdpexpect.fdspawn.__init__(self, fd)
+        self.delaybeforesend = None # fdspawn.send never waits before sending, and spawnGame in python_module3_marker.py turns the wait off for pexpect.spawn too so both launchers play the games in the same way
+        self.pid = pid # the zygote does not reap a game until after we have closed it, so this pid can't be reused by another process while we hold it
+
+    def close(self):
+        if self.child_fd == -1:
+            return
+        try:
+            os.kill(self.pid, signal.SIGKILL) # a game that is still waiting for a guess needs to be stopped, just like pexpect.spawn does on close
+        except OSError: # the game has already finished
+            pass
+        fdpexpect.fdspawn.close(self)
+
+class Zygote():
+    """
+    This is a pre-initialised Python interpreter that forks a fresh child for each hangman game instead of starting a new interpreter every time. The child runs the student's script as __main__ on its own pty, so to the student's script it looks the same as running `python student_script.py`.
+
+    Args:
+        python (str): The Python interpreter to use. This should be the same one that solveGame would spawn.
+
+    Raises:
+        OSError if the zygote can not be started.
+    """
+
+    def __init__(self, python = 'python'):
+        self.python = python
+        parent_sock, child_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET) # each request and reply is a single message
+        try:
+            self.process = subprocess.Popen([python, os.path.abspath(__file__), str(child_sock.fileno())], pass_fds = [child_sock.fileno()], stdin = subprocess.DEVNULL, stdout = subprocess.DEVNULL)
+        finally:
+            child_sock.close()
+        self.sock = parent_sock
+        if self.sock.recv(64) != b'ready': # wait until the zygote has finished importing so the first game isn't charged for it
+            self.close()
+            raise OSError('zygote did not start')
+        self.cold_start_latency = measureColdStart(python) # what each game would have cost without the zygote
+
+    def spawn(self, file_path):
+        """
+        Forks a new hangman game from the zygote.
+
+        Args:
+            file_path (str): A string of a path to the student's hangman script.
+
+        Returns:
+            (child (ZygoteChild), spawn_latency (float)) (tup): child is used in the same way as a pexpect child and spawn_latency is the number of seconds it took to get the game running.
+
+        Raises:
+            OSError if the zygote has died.
+        """
+
+        start = time.monotonic()
+        self.sock.send(json.dumps({'file_path': file_path, 'cwd': os.getcwd()}).encode())
+        msg, fds, _, _ = socket.recv_fds(self.sock, 1024, 1)
+        if not msg or not fds:
+            raise OSError('zygote died')
+        reply = json.loads(msg.decode())
+        return ZygoteChild(fds[0], reply['pid']), time.monotonic() - start
+
+    def alive(self):
+        return self.process.poll() is None
+
+    def close(self):
+        self.sock.close() # the zygote exits when it sees the socket close
+        try:
+            self.process.wait(timeout = 5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+def measureColdStart(python = 'python', repetitions = 3):
+    """
+    Times how long it takes to start and stop an empty Python interpreter. This is what the zygote saves on every game.
+
+    Args:
+        python (str): The Python interpreter to time.
+        repetitions (int): The number of times to start the interpreter (the fastest time is used).
+
+    Returns (float):
+        The number of seconds that the fastest cold start took.
+
+    Raises:
+        None.
+    """
+
+    timings = []
+    for _ in range(repetitions):
+        start = time.monotonic()
+        subprocess.run([python, '-c', 'pass'], stdin = subprocess.DEVNULL, stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL)
+        timings.append(time.monotonic() - start)
+    return min(timings)
+
+def forkIsSafe():
+    """
+    Checks if the zygote can be used on this platform. Forking needs os.fork, ptys and passing file descriptors over sockets, and forking on macOS is unsafe once system frameworks have been loaded.
+
+    Returns (bool):
+        True if the zygote can be used.
+    """
+
+    return os.name == 'posix' and sys.platform != 'darwin' and hasattr(os, 'fork') and hasattr(socket, 'send_fds')
+
+_zygote = None # one zygote per worker process
+_zygote_pid = None # the process that started _zygote (a forked worker must not share its parent's zygote)
+
+def getZygote():
+    """
+    Returns the zygote of this process, starting one if needed. None is returned if forking is unsafe or the zygote can not be started, in which case the caller should fall back to pexpect.spawn.
+    """
+
+    global _zygote, _zygote_pid
+    if not forkIsSafe():
+        return None
+    if _zygote is not None and (_zygote_pid != os.getpid() or not _zygote.alive()):
+        _zygote = None # the zygote belongs to another process or has died so start a new one
+    if _zygote is None:
+        try:
+            _zygote = Zygote()
+            _zygote_pid = os.getpid()
+        except OSError:
+            return None
+    return _zygote
+
+def _runGame(file_path, cwd):
+    # this runs in the forked child with the pty as its stdin, stdout and stderr, and mimics `python file_path`
+    import runpy
+    import random
+    import atexit
+    import traceback
+    random.seed() # make sure each game picks a different word from the one the zygote would have picked
+    os.chdir(cwd)
+    sys.stdin = sys.__stdin__ = open(0, 'r', closefd = False)
+    sys.stdout = sys.__stdout__ = open(1, 'w', buffering = 1, closefd = False) # line buffered as it is a terminal
+    sys.stderr = sys.__stderr__ = open(2, 'w', buffering = 1, closefd = False)
+    sys.argv = [file_path]
+    sys.path[0] = os.path.dirname(os.path.abspath(file_path))
+    exit_code = 0
+    try:
+        runpy.run_path(file_path, run_name = '__main__')
+    except SystemExit as e:
+        if e.code is None:
+            exit_code = 0
+        elif isinstance(e.code, int):
+            exit_code = e.code
+        else:
+            print(e.code, file = sys.stderr)
+            exit_code = 1
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+    try:
+        atexit._run_exitfuncs()
+        sys.stdout.flush()
+        sys.stderr.flush()
+    finally:
+        os._exit(exit_code)
+
+def _serve(sock_fd):
+    # this is the main loop of the zygote process
+    import pty
+    for module in preload_modules:
+        __import__(module)
+    sock = socket.socket(fileno = sock_fd)
+    sock.send(b'ready')
+    while True:
+        try:
+            msg = sock.recv(65536)
+        except OSError:
+            break
+        if not msg: # the worker has gone so the zygote is no longer needed
+            break
+        while True: # reap the games that the worker has finished with
+            try:
+                if os.waitpid(-1, os.WNOHANG)[0] == 0:
+                    break
+            except ChildProcessError:
+                break
+        request = json.loads(msg.decode())
+        pid, master_fd = pty.fork()
+        if pid == 0:
+            sock.close()
+            _runGame(request['file_path'], request['cwd'])
+        socket.send_fds(sock, [json.dumps({'pid': pid}).encode()], [master_fd])
+        os.close(master_fd)
+
+if __name__ == "__main__":
+    _serve(int(sys.argv[1]))
@@ -1,133 +1,279 @@
 import pexpect
 import random
+import time
 import tqdm
 import multiprocessing as mp
 import pandas as pd
 import pickle as pkl
+import hangman_zygote
+import hangman_policy
+from hangman_timings import newTimings, recordTiming
+from hangman_parser import OutputParser, expectStop
 
 # this is a list of the words that the students need to read from the word_list.txt file
 all_words = ['rarely', 'universe', 'notice', 'sugar', 'interference', 'constitution', 'we', 'minus', 'breath', 'clarify', 'take', 'recording', 'amendment', 'hut', 'tip', 'logical', 'cast', 'title', 'brief', 'none', 'relative', 'recently', 'detail', 'port', 'such', 'complex', 'bath', 'soul', 'holder', 'pleasant', 'buy', 'federal', 'lay', 'currently', 'saint', 'for', 'simple', 'deliberately', 'means', 'peace', 'prove', 'sexual', 'chief', 'department', 'bear', 'injection', 'off', 'son', 'reflect', 'fast', 'ago', 'education', 'prison', 'birthday', 'variation', 'exactly', 'expect', 'engine', 'difficulty', 'apply', 'hero', 'contemporary', 'that', 'surprised', 'fear', 'convert', 'daily', 'yours', 'pace', 'shot', 'income', 'democracy', 'albeit', 'genuinely', 'commit', 'caution', 'try', 'membership', 'elderly', 'enjoy', 'pet', 'detective', 'powerful', 'argue', 'escape', 'timetable', 'proceeding', 'sector', 'cattle', 'dissolve', 'suddenly', 'teach', 'spring', 'negotiation', 'solid', 'seek', 'enough', 'surface', 'small', 'search']
 
-def solveGame(file_path):
+def spawnGame(file_path, launcher, hist):
+    """
+    Starts the student's hangman script. By default a new Python interpreter is spawned for every game but with launcher = 'zygote' the game is forked from a pre-initialised interpreter (see hangman_zygote.py) which avoids paying for interpreter start up on every game. If forking is unsafe on this platform or the zygote can not be started then it falls back to spawning a new interpreter.
+
+    Args:
+        file_path (str): A string of a path to the student's hangman script.
+        launcher (str): Either 'spawn' or 'zygote'.
+        hist (dict): The hist of the game. When the zygote is used the spawn latency (float) and the spawn latency saved compared with a cold start of the interpreter (float) are added as 'spawn_latency' and 'spawn_latency_saved'.
+
+    Returns:
+        A pexpect child that is connected to the student's game.
+
+    Raises:
+        Any error raised by pexpect.spawn.
+    """
+
+    if launcher == 'zygote':
+        zygote = hangman_zygote.getZygote()
+        if zygote is not None:
+            try:
+                child, spawn_latency = zygote.spawn(file_path)
+                hist['spawn_latency'] = spawn_latency
+                hist['spawn_latency_saved'] = zygote.cold_start_latency - spawn_latency
+                return child
+            except OSError: # the zygote has died so fall back to spawning a new interpreter (a new zygote is started for the next game)
+                pass
+    child = pexpect.spawn('python ' + file_path)
+    # pexpect waits 50 ms before every send and 100 ms after closing the pty by default, which the zygote's children don't (see ZygoteChild in hangman_zygote.py). The student's input() reads the guess whenever it arrives and a script that is still running when it is closed is terminated anyway, so the waits aren't needed, and without them both launchers play the games in the same way and only differ in how the interpreter is started
+    child.delaybeforesend = None
+    child.ptyproc.delayafterclose = 0
+    return child
+
+def newGameState(hist):
+    """
+    Creates the state that our strategy needs to keep between turns of a single game (see the playTurn function).
+
+    Args:
+        hist (dict): The hist of the game that playTurn should update.
+
+    Returns (dict):
+        first_loop (bool): True until the first guess has been asked for. no_of_letters (int): the number of letters in the word we need to guess. remaining_mask (int): a bitset of the words in all_words that could still be the word we need to guess (see hangman_policy.py). vowel_list (list(str)): the vowels that have not been guessed yet. hist (dict): the hist passed to the function.
+    """
+
+    vowels = 'aeiouy' # aparently 'y' is a vowel! I did not know that!
+    return {'first_loop': True, 'no_of_letters': None, 'remaining_mask': None, 'vowel_list': [vowel for vowel in vowels], 'hist': hist}
+
+def playTurn(game_state, bfr_txt, afr_txt):
+    """
+    This plays one turn of our strategy (see the solveGame function for a description of the strategy). It is separate from solveGame so that any way of communicating with the student's script can use exactly the same strategy.
+
+    Args:
+        game_state (dict): The state of the game returned by the newGameState function. This is updated in place.
+        bfr_txt (str): The lower case and whitespace normalised text that the student's script printed before it stopped.
+        afr_txt (str or pexpect.EOF): The lower case and whitespace normalised text that the student's script stopped on, or pexpect.EOF if the script ended.
+
+    Returns:
+        (finished (bool), value (bool or str)) (tup): if finished is True then the game is over and value is the result of the game (i.e. True, False, or an error code as returned by solveGame). Otherwise value is the letter that should be sent to the game as our next guess.
+
+    Raises:
+        None.
+    """
+
+    hist = game_state['hist']
+    policy = hangman_policy.getPolicy(all_words) # our strategy compiled into lookup tables
+    if afr_txt == pexpect.EOF: # if game has ended test to see if the game was won, lost or if it ended in a unacceptable way
+        if 'congratulations you win' in bfr_txt: # we won!
+            return True, True
+        elif 'you lose' in bfr_txt: # we lost!
+            return True, False
+        else: # unacceptable way to end the game!
+            return True, 'Return error'
+    elif 'please enter your next guess' in afr_txt: # this shows that the game is asking for the next guess
+        if game_state['first_loop']: # when in the ffirst loop we need to determine how many letters are in the word that we need to guess, remove all words from our word list that are not that length, update the hist['remaining_words_hist'] list and turn the first_loop variable to false so this process is skipped for other iterations of the loop
+            game_state['no_of_letters'] = bfr_txt.count('*')
+            game_state['first_loop'] = False
+            game_state['remaining_mask'] = policy.length_masks.get(game_state['no_of_letters'], 0) # all the words that are the same length as the word we need to guess
+            hist['remaining_words_hist'].append(policy.lookup(game_state['remaining_mask'])[0])
+        no_of_letters = game_state['no_of_letters']
+
+        word_progress = bfr_txt[-no_of_letters:] # the last letters of this string should be the astericked word
+        hist['word_progress_hist'].append(word_progress) # update hist
+        if word_progress.count('*') == len(word_progress): # this means that we have made no correct guesses yet and so we know that a vowel must exist in the word
+            try:
+                vowel = game_state['vowel_list'].pop(0) # guess a vowel that has not already been guessed
+            except: # if an error occurs then it must mean the list is empty which means that either the word we are trying to guess does not have a vowel in (which is impossible if they are using the correct word list) or the game is not processing our guesses correctly
+                return True, 'Vowel error'
+
+            hist['guess_hist'].append(vowel) # update hist
+            return False, vowel # send our guess to the game
+        else: # if here then we must have guessed atleast one letter correctly.
+            game_state['remaining_mask'] &= policy.patternMask(word_progress) # this removes words from the remaining words that don't match our guesses
+            remaining_words, letters_by_occurence = policy.lookup(game_state['remaining_mask']) # the remaining words and their letter frequencies ordered so that the letters that occur the most are at the top of the list (these are worked out once and shared between games so they must not be changed)
+            hist['remaining_words_hist'].append(remaining_words) # update hist
+            hist['letters_by_occurence_hist'].append(letters_by_occurence) # update hist
+            for letter_tuple in letters_by_occurence: # we want to guess the letter with the highest frequency but we might have already correctly guessed that letter so we want to skip the ones that have already been guessed
+                if letter_tuple[0] not in word_progress:
+                    tmp_guess = letter_tuple[0]
+                    break
+
+            hist['guess_hist'].append(tmp_guess) # update hist
+            return False, tmp_guess # send our next guess to the hangman game
+    else: # if here then the game has stopped without ending the game corerctly or asking for a new guess which is stated in the instructions
+        return True, 'EOF/input error'
+
+def newTimeouts(first_prompt = 3, minimum = 0.2, maximum = 1, factor = 5, min_responses = 5):
+    """
+    Creates the adaptive expect timeouts of one student's script, which are passed to solveGame for every game of that script. Instead of always waiting one second for the script to respond, the first prompt of each game gets a generous timeout (as it includes starting Python) and once the script has responded min_responses times the timeout of the other prompts is factor times the slowest response seen so far (but at least minimum and at most maximum seconds). A script that hangs then only costs a fraction of a second once it has shown that it normally responds quickly.
+
+    Args:
+        first_prompt (float): The timeout in seconds for the first prompt of each game.
+        minimum (float): The shortest timeout in seconds for the other prompts.
+        maximum (float): The longest timeout in seconds for the other prompts (and the timeout before min_responses responses have been seen).
+        factor (float): How many times the slowest response seen so far to wait.
+        min_responses (int): The number of responses that need to be seen before the timeout is shortened.
+
+    Returns (dict):
+        The settings and the number of responses (no_responses) and slowest response (max_latency) seen so far, which solveGame updates.
+    """
+
+    return {'first_prompt': first_prompt, 'minimum': minimum, 'maximum': maximum, 'factor': factor, 'min_responses': min_responses, 'no_responses': 0, 'max_latency': 0}
+
+def expectTimeout(timeouts, first_prompt):
+    """
+    Returns the number of seconds to wait for the student's script to ask for a guess or end, from the timeouts created by newTimeouts (or one second if timeouts is None, which is what solveGame has always used).
+    """
+
+    if timeouts == None:
+        return 1
+    if first_prompt:
+        return timeouts['first_prompt']
+    if timeouts['no_responses'] < timeouts['min_responses']:
+        return timeouts['maximum']
+    return min(timeouts['maximum'], max(timeouts['minimum'], timeouts['factor'] * timeouts['max_latency']))
+
+def recordLatency(timeouts, latency):
+    """
+    Records how many seconds the student's script took to respond to a guess so that expectTimeout can adapt to it.
+    """
+
+    if timeouts != None:
+        timeouts['no_responses'] += 1
+        timeouts['max_latency'] = max(timeouts['max_latency'], latency)
+
+def skippedResult(error):
+    """
+    Returns the object that stands in for a game that was not played because the circuit breaker of the file tripped (see the repeatedError function). The result is the error code that tripped it and hist is marked as 'skipped'.
+    """
+
+    return error, {'skipped': True, 'guess_hist': [], 'word_progress_hist': [], 'remaining_words_hist': [], 'letters_by_occurence_hist': []}
+
+def repeatedError(results, max_repeated_errors):
+    """
+    This is the circuit breaker of a file. Errors are almost always caused by a mistake in the student's script so they happen every time, and replaying the file just wastes time.
+
+    Args:
+        results (list): The objects returned by the solveGame function for the games of a file played so far.
+        max_repeated_errors (None or int): The number of times the same error code has to be returned before the file stops being played. None turns the circuit breaker off.
+
+    Returns (str or None):
+        The error code that has been returned max_repeated_errors times, or None if the file should carry on being played.
+    """
+
+    if max_repeated_errors == None:
+        return None
+    error_counts = {}
+    for result in results:
+        if result[0] not in [True, False]:
+            error_counts[result[0]] = error_counts.get(result[0], 0) + 1
+            if error_counts[result[0]] >= max_repeated_errors:
+                return result[0]
+    return None
+
+def solveGame(file_path, launcher = 'spawn', timeouts = None, timing_hook = None):
     """
     This method tests student's hangman scripts according to the structure of the third module 'Python' instructions. It automatically plays the game to detect that it works correctly.
 
     Args:
         file_path (str): A string of a path to the student's hangman script.
+        launcher (str): How the student's script is started, either 'spawn' (default) to run it in a new Python interpreter or 'zygote' to fork it from a pre-initialised interpreter (see the spawnGame function).
+        timeouts (None or dict): The default of None waits one second for the script to respond every time. Otherwise the adaptive timeouts of this script created by the newTimeouts function, which are updated with how quickly the script responded.
+        timing_hook (None or callable): If not None this is called as timing_hook(file_path, phase, start, duration) every time a phase of the game has been timed (see the recordTiming function in hangman_timings.py), so that an external profiler can follow the games.
 
     Returns:
-        (return result (bool or str), hist (dict)) (tup): result is either True (bool), False (bool), or an error code (str). This means that our program won the game, lost the game, or was unable to finish the game because of some error, respectively. hist contains details about what happened in the gamer. guess_hist (list(str)): the guesses made by this program. word_progress_hist (list(str)): how the astericked word progressed as guesses were made. remaining_words_hist (list(list(str))): the program starts with a list of all the possible words and eliminates words as guesses are made this is a history of the remaining words. letters_by_occurence_hist (list(dict)): is a list of dictionaries where each dictionary shows the letter frequencies of all the words in the remaining words list at the time of that guess.
+        (return result (bool or str), hist (dict)) (tup): result is either True (bool), False (bool), or an error code (str). This means that our program won the game, lost the game, or was unable to finish the game because of some error, respectively. hist contains details about what happened in the gamer. guess_hist (list(str)): the guesses made by this program. word_progress_hist (list(str)): how the astericked word progressed as guesses were made. remaining_words_hist (list(list(str))): the program starts with a list of all the possible words and eliminates words as guesses are made this is a history of the remaining words. letters_by_occurence_hist (list(dict)): is a list of dictionaries where each dictionary shows the letter frequencies of all the words in the remaining words list at the time of that guess. timings (dict): how many seconds each phase of the game took, using a monotonic clock. spawn, the time to start the script, and total, the whole game, are single numbers and expect (waiting for the script to ask for a guess or end, the first includes the script starting up), decode (getting the normalised text the script printed from the parser, most of the decoding happens as it is read so it is part of expect), guess (working out the next guess) and send (sending it) have one entry per turn (see hangman_timings.py).
 
     Raises:
         All errors should be dealt with try and exception statements so that an error string is returned instead of a Python Error being raised.
 
     The library 'pexpect' is used to communicate with the student's hangman game.
 
-    Our strategy starts with a list of all possible words, removes all words that don't match the length of the word we need to guess. It then guesses each vowel until a correct guess is made. Any words that don't contain the vowel in that location are removed from the word list. Once one vowel is correctly guessed the program then calculates all the letter frequencies of all the remaining words and then guesses the one that occurs the most (that hasn't already been guessed). This strategy was shown to win the game roughly 71% of the time.
+    Our strategy starts with a list of all possible words, removes all words that don't match the length of the word we need to guess. It then guesses each vowel until a correct guess is made. Any words that don't contain the vowel in that location are removed from the word list. Once one vowel is correctly guessed the program then calculates all the letter frequencies of all the remaining words and then guesses the one that occurs the most (that hasn't already been guessed). This strategy wins the game 78% of the time when the word is picked from all_words using a uniform distribution (this is worked out exactly by playing every word in hangman_simulator.py).
 
     """
 
+    game_start = time.monotonic()
+    result, hist = _solveGame(file_path, launcher, timeouts, timing_hook)
+    recordTiming(hist['timings'], 'total', game_start, file_path, timing_hook)
+    return result, hist
+
+def _solveGame(file_path, launcher, timeouts, timing_hook):
+    # plays the game for solveGame, which times the whole game
     # Load neccessary variables
-    hist = {'guess_hist': [], 'word_progress_hist': [], 'remaining_words_hist': [], 'letters_by_occurence_hist': []} # This will hold the progressing of the game
-    all_letters = 'abcdefghijklmnopqrstuvwxyz'
-    consonants = 'bcdfghjklmnpqrstvwxz'
-    vowels = 'aeiouy' # aparently 'y' is a vowel! I did not know that!
-    vowel_list = [vowel for vowel in vowels]
+    hist = {'guess_hist': [], 'word_progress_hist': [], 'remaining_words_hist': [], 'letters_by_occurence_hist': [], 'timings': newTimings()} # This will hold the progressing of the game
+    timings = hist['timings']
+    game_state = newGameState(hist)
     # run the student's hangman script and catch an errors
     try:
-        child = pexpect.spawn('python ' + file_path)
-        child.timeout = 1 # set the timeout wait to one second
+        spawn_start = time.monotonic()
+        child = spawnGame(file_path, launcher, hist)
     except:
         child.close()
         return 'Spawn error', hist
+    recordTiming(timings, 'spawn', spawn_start, file_path, timing_hook)
     # Create a while loop that runs until the game is completed
-    finished_flag = False # tells the while loop when to stop (i.e. when the game has finished)
-    first_loop = True # Indicates if it is within the first loop
-    while not finished_flag:
+    parser = OutputParser() # reads the output of the script as it arrives and keeps only what our strategy needs (see hangman_parser.py)
+    first_prompt = True
+    while True:
         # If written correctly the student's script will only ever stop to ask for the user to make a guess with the string 'Please enter your next guess: ' or because the game is finished. This tests for this.
         try: 
-            child.expect(['Please enter your next guess: ', pexpect.EOF]) # look for the program to ask for a new guess or the end of the game
+            sent_time = time.monotonic()
+            expectStop(child, parser, expectTimeout(timeouts, first_prompt)) # look for the program to ask for a new guess or the end of the game (the same as child.expect(['Please enter your next guess: ', pexpect.EOF]))
         except:
+            recordTiming(timings, 'expect', sent_time, file_path, timing_hook) # the time spent waiting before giving up
             child.close()
             return 'Expect error', hist # The program has stopped for a reason other than what was specified in the student's instructions
+        latency = recordTiming(timings, 'expect', sent_time, file_path, timing_hook) # how long the script took to respond
+        if not first_prompt: # the first prompt includes starting Python so it isn't used to adapt the timeouts
+            recordLatency(timeouts, latency)
+        first_prompt = False
 
         # this program needs to know what the student's script did before and at the time if the stop (pexpect classes this as after the stop which doesn't make sense to me but explains the variable names below).
+        decode_start = time.monotonic()
         try:
-            bfr_txt = child.before.decode().strip().lower() # gets the before string, converts it from binary into a string then strips it and converts it into lowercase letters
-            bfr_txt = " ".join(bfr_txt.split()) # removes any double spaces from the string
+            bfr_txt = parser.before() # the lower case text the script printed before it stopped with any double spaces removed (the parser decodes it as it arrives and only keeps the end of it)
         except:
             child.close()
-            return 'bfr decode error', hist # either the before string object was not in binary (which it should be if the program is built according to the instructions)
-        try:
-            afr_txt = child.after.decode().strip().lower() # gets the before string, converts it from binary into a string then strips it and converts it into lowercase letters
-            afr_txt = " ".join(afr_txt.split()) # removes any double spaces from the string
-        except:
-            if child.after == pexpect.EOF: # it is OK to throw an error in the try above if it's because the game ended (i.e. returned EOF)
-                afr_txt = child.after # EOF does not need decoding etc cause it is not a string
-            else: # if the try above failed and afr_txt is not EOF file the program is not built according to instructions so return error code
-                child.close()
-                return 'afr decode error', hist
-        if afr_txt == pexpect.EOF: # if game has ended test to see if the game was won, lost or if it ended in a unacceptable way
-            if 'congratulations you win' in bfr_txt: # we won!
-                child.close()
-                return True, hist
-            elif 'you lose' in bfr_txt: # we lost!
-                child.close()
-                return False, hist
-            else: # unacceptable way to end the game!
-                child.close()
-                return 'Return error', hist
-        elif 'please enter your next guess' in afr_txt: # this shows that the game is asking for the next guess
-            if first_loop: # when in the ffirst loop we need to determine how many letters are in the word that we need to guess, remove all words from our word list that are not that length, update the hist['remaining_words_hist'] list and turn the first_loop variable to false so this process is skipped for other iterations of the loop
-                no_of_letters = bfr_txt.count('*')
-                first_loop = False
-                remaining_words = [word for word in all_words if len(word) == no_of_letters]
-                hist['remaining_words_hist'].append(remaining_words)
-
-            word_progress = bfr_txt[-no_of_letters:] # the last letters of this string should be the astericked word
-            hist['word_progress_hist'].append(word_progress) # update hist
-            if word_progress.count('*') == len(word_progress): # this means that we have made no correct guesses yet and so we know that a vowel must exist in the word
-                try:
-                    vowel = vowel_list.pop(0) # guess a vowel that has not already been guessed
-                except: # if an error occurs then it must mean the list is empty which means that either the word we are trying to guess does not have a vowel in (which is impossible if they are using the correct word list) or the game is not processing our guesses correctly
-                    child.close()
-                    return 'Vowel error', hist
-
-                child.sendline(vowel) # send our guess to the game
-                hist['guess_hist'].append(vowel) # update hist
-            else: # if here then we must have guessed atleast one letter correctly.
-                idx_to_letter_dict = {idx: word_progress[idx] for idx in range(len(word_progress)) if word_progress[idx] != '*'} # dictionary where the keys are the indexes of the word string that have been guessed correctly and the values are the corresponding letter
-                remaining_words = [word for word in remaining_words if ( sum([word[idx] == idx_to_letter_dict[idx] for idx in idx_to_letter_dict.keys()]) == len([word[idx] == idx_to_letter_dict[idx] for idx in idx_to_letter_dict.keys()]) ) ] # this removes words from the remaining word list that don't match our guesses
-                hist['remaining_words_hist'].append(remaining_words) # update hist
-                letter_occurences = {letter: 0 for letter in all_letters} # create a dict that will count all the letter frequencies from the remainind words list so that we can decide which letter is most likely to be correct on our next guess
-                for word in remaining_words:
-                    for letter in word:
-                        letter_occurences[letter] += 1
-
-                letters_by_occurence = sorted(letter_occurences.items(), key = lambda kv: kv[1], reverse = True) # order it so that the letters that occur the most occur at the the top of the list
-                hist['letters_by_occurence_hist'].append(letters_by_occurence) # update hist
-                for letter_tuple in letters_by_occurence: # we want to guess the letter with the highest frequency but we might have already correctly guessed that letter so we want to skip the ones that have already been guessed
-                    if letter_tuple[0] not in word_progress:
-                        tmp_guess = letter_tuple[0]
-                        break
-
-                child.sendline(tmp_guess) # send our next guess to the hangman game
-                hist['guess_hist'].append(tmp_guess) # update hist
-        else: # if here then the game has stopped without ending the game corerctly or asking for a new guess which is stated in the instructions
+            return 'bfr decode error', hist # the before string could not be decoded (which it should be if the program is built according to the instructions)
+        afr_txt = parser.after() # the lower case prompt or pexpect.EOF if the game ended (as the prompt is fixed this can't fail to decode so 'afr decode error' is no longer returned)
+        recordTiming(timings, 'decode', decode_start, file_path, timing_hook)
+        guess_start = time.monotonic()
+        finished, value = playTurn(game_state, bfr_txt, afr_txt) # work out what to do next using our strategy
+        recordTiming(timings, 'guess', guess_start, file_path, timing_hook)
+        if finished: # the game has finished (won, lost or errored) and value is the result
             child.close()
-            return 'EOF/input error', hist
+            return value, hist
+        send_start = time.monotonic()
+        child.sendline(value) # send our next guess to the hangman game
+        recordTiming(timings, 'send', send_start, file_path, timing_hook)
 
 def solveGameWord(file_path, word):
     """
     This is a function similar to solveGame except that the student's game asks for the word that needs to be guessed. This was used in the development stage and is unlikely to be needed again but is here for completeness but i have not bothered to comment etc.
     """
-    hist = {'word': word, 'guess_hist': [], 'word_progress_hist': [], 'remaining_words_hist': [], 'letters_by_occurence_hist': []}
+    hist = {'word': word, 'guess_hist': [], 'word_progress_hist': [], 'remaining_words_hist': [], 'letters_by_occurence_hist': [], 'timings': newTimings()}
     all_letters = 'abcdefghijklmnopqrstuvwxyz'
     consonants = 'bcdfghjklmnpqrstvwxz'
     vowels = 'aeiouy'
     vowel_list = [vowel for vowel in vowels]
     try:
         child = pexpect.spawn('python -c "import ' + file_path[:-3] + ';print(' + file_path[:-3] + '.playGame(\'' + word + '\'))')
+        child.delaybeforesend = None # the same as spawnGame
     except:
         child.close()
         return 'Spawn error', hist
@@ -136,10 +282,12 @@ def solveGameWord(file_path, word):
     first_loop = True
     while not finished_flag:
         try: 
+            sent_time = time.monotonic()
             child.expect(['Please enter your next guess: ', pexpect.EOF])
         except:
             child.close()
             return 'Expect error', hist
+        recordTiming(hist['timings'], 'expect', sent_time)
 
         try:
             bfr_txt = child.before.decode().strip().lower()
@@ -208,12 +356,14 @@ def solveGameWord(file_path, word):
 
 # the following code was used to test the accuracy of the algorithm on a 100 repetitions of 100 game tests (i.e. the script was tested 10,000 times). We found that the alforithm correctly guessed the word ~71% of the time
 if __name__ == "__main__":
+    from hangman_direct import solveGameWordDirect # imports the student's script once per process and calls playGame(word) directly instead of starting a new interpreter for every game
     file_name = 'OC_HM_iterative_words.py'
 
     results = []
+    pool = mp.Pool(initializer = hangman_policy.setPolicy, initargs = (hangman_policy.getPolicy(all_words),)) # one pool for all of the repetitions so each worker only imports the student's script once, and our strategy is only compiled once
     for it in tqdm.tqdm(range(100)): # show progress bar for 100 repetitions of the test
         rand_words = [all_words[random.randint(0, len(all_words) - 1)] for _ in range(100)] # generate random word list
-        pool = mp.Pool()
-        results.append(pool.starmap(solveGameWord, zip([file_name] * 100, rand_words))) # calculate 100 games in parallel
+        results.append(pool.starmap(solveGameWordDirect, zip([file_name] * 100, rand_words))) # calculate 100 games in parallel
+    pool.close()
     with open('100x100_rand_results.pkl', 'wb') as f: # save the results as a pickle file
         pkl.dump(results, f)
@@ -0,0 +1,39 @@
+# a correct game that prints a large gallows and every guess so far before each prompt, so the marker has a lot of output to read every turn
+import random
+
+def loadWords():
+    with open('word_list.txt') as f:
+        return [line.strip() for line in f if line.strip()]
+
+def gallows(no_wrong_guesses):
+    lines = ['=' * 78]
+    for row in range(200):
+        if row < no_wrong_guesses * 28:
+            lines.append('  ||' + ' ' * 30 + '|' + ' ' * 10 + 'O/|\\' * 8)
+        else:
+            lines.append('  ||' + ' ' * 74)
+    lines.append('=' * 78)
+    return '\n'.join(lines)
+
+def playGame(word):
+    guessed = set()
+    guesses = []
+    no_wrong_guesses = 0
+    while True:
+        word_progress = ''.join([letter if letter in guessed else '*' for letter in word])
+        if '*' not in word_progress:
+            return 'Congratulations you win'
+        if no_wrong_guesses >= 7:
+            return 'You lose'
+        print(gallows(no_wrong_guesses))
+        print('Guesses so far: ' + ', '.join(guesses))
+        print(word_progress)
+        guess = input('Please enter your next guess: ').strip().lower()
+        guesses.append(guess)
+        if guess in word:
+            guessed.add(guess)
+        else:
+            no_wrong_guesses += 1
+
+if __name__ == "__main__":
+    print(playGame(random.choice(loadWords())))
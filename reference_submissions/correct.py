@@ -0,0 +1,26 @@
+# a correctly written hangman game, which our strategy should beat as often as T_prob
+import random
+
+def loadWords():
+    with open('word_list.txt') as f:
+        return [line.strip() for line in f if line.strip()]
+
+def playGame(word):
+    guessed = set()
+    no_wrong_guesses = 0
+    while True:
+        word_progress = ''.join([letter if letter in guessed else '*' for letter in word])
+        if '*' not in word_progress:
+            return 'Congratulations you win'
+        if no_wrong_guesses >= 7:
+            return 'You lose'
+        print('You have', 7 - no_wrong_guesses, 'lives left')
+        print(word_progress)
+        guess = input('Please enter your next guess: ').strip().lower()
+        if guess in word:
+            guessed.add(guess)
+        else:
+            no_wrong_guesses += 1
+
+if __name__ == "__main__":
+    print(playGame(random.choice(loadWords())))
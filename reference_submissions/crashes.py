@@ -0,0 +1,28 @@
+# raises an error on its first guess, so every game ends with a 'Return error'
+import random
+
+def loadWords():
+    with open('word_list.txt') as f:
+        return [line.strip() for line in f if line.strip()]
+
+def playGame(word):
+    guesses = []
+    no_wrong_guesses = 0
+    guessed = set()
+    while True:
+        word_progress = ''.join([letter if letter in guessed else '*' for letter in word])
+        if '*' not in word_progress:
+            return 'Congratulations you win'
+        if no_wrong_guesses >= 7:
+            return 'You lose'
+        print(word_progress)
+        guess = input('Please enter your next guess: ').strip().lower()
+        guesses.append(guess)
+        print('Your last guess was', guesses[-2])
+        if guess in word:
+            guessed.add(guess)
+        else:
+            no_wrong_guesses += 1
+
+if __name__ == "__main__":
+    print(playGame(random.choice(loadWords())))
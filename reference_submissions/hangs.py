@@ -0,0 +1,30 @@
+# stops responding after its third guess, so every game ends with an 'Expect error'
+import time
+import random
+
+def loadWords():
+    with open('word_list.txt') as f:
+        return [line.strip() for line in f if line.strip()]
+
+def playGame(word):
+    guessed = set()
+    no_guesses = 0
+    no_wrong_guesses = 0
+    while True:
+        word_progress = ''.join([letter if letter in guessed else '*' for letter in word])
+        if '*' not in word_progress:
+            return 'Congratulations you win'
+        if no_wrong_guesses >= 7:
+            return 'You lose'
+        print(word_progress)
+        guess = input('Please enter your next guess: ').strip().lower()
+        no_guesses += 1
+        while no_guesses >= 3:
+            time.sleep(1)
+        if guess in word:
+            guessed.add(guess)
+        else:
+            no_wrong_guesses += 1
+
+if __name__ == "__main__":
+    print(playGame(random.choice(loadWords())))
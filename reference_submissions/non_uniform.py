@@ -0,0 +1,25 @@
+# picks the shortest of three random words, so short words (which our strategy loses more often) come up far more often than they should
+import random
+
+def loadWords():
+    with open('word_list.txt') as f:
+        return [line.strip() for line in f if line.strip()]
+
+def playGame(word):
+    guessed = set()
+    no_wrong_guesses = 0
+    while True:
+        word_progress = ''.join([letter if letter in guessed else '*' for letter in word])
+        if '*' not in word_progress:
+            return 'Congratulations you win'
+        if no_wrong_guesses >= 7:
+            return 'You lose'
+        print(word_progress)
+        guess = input('Please enter your next guess: ').strip().lower()
+        if guess in word:
+            guessed.add(guess)
+        else:
+            no_wrong_guesses += 1
+
+if __name__ == "__main__":
+    print(playGame(min(random.sample(loadWords(), 3), key = len)))
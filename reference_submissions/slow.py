@@ -0,0 +1,27 @@
+# a correct game that takes a tenth of a second to respond to each guess
+import time
+import random
+
+def loadWords():
+    with open('word_list.txt') as f:
+        return [line.strip() for line in f if line.strip()]
+
+def playGame(word):
+    guessed = set()
+    no_wrong_guesses = 0
+    while True:
+        time.sleep(0.1)
+        word_progress = ''.join([letter if letter in guessed else '*' for letter in word])
+        if '*' not in word_progress:
+            return 'Congratulations you win'
+        if no_wrong_guesses >= 7:
+            return 'You lose'
+        print(word_progress)
+        guess = input('Please enter your next guess: ').strip().lower()
+        if guess in word:
+            guessed.add(guess)
+        else:
+            no_wrong_guesses += 1
+
+if __name__ == "__main__":
+    print(playGame(random.choice(loadWords())))
@@ -0,0 +1,23 @@
+# picks its word from its own list instead of word_list.txt, so its games don't match any word our strategy expects
+import random
+
+words = ['python', 'marker', 'hangman', 'keyboard', 'gallows', 'student', 'lecture', 'exam', 'grade', 'module']
+
+def playGame(word):
+    guessed = set()
+    no_wrong_guesses = 0
+    while True:
+        word_progress = ''.join([letter if letter in guessed else '*' for letter in word])
+        if '*' not in word_progress:
+            return 'Congratulations you win'
+        if no_wrong_guesses >= 7:
+            return 'You lose'
+        print(word_progress)
+        guess = input('Please enter your next guess: ').strip().lower()
+        if guess in word:
+            guessed.add(guess)
+        else:
+            no_wrong_guesses += 1
+
+if __name__ == "__main__":
+    print(playGame(random.choice(words)))